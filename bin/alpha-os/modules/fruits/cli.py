@@ -12,7 +12,7 @@ parent_dir = script_dir.parent
 sys.path.insert(0, str(parent_dir))
 
 import random
-from fruits.config import FRUIT_EMOJIS, CSV_FILE
+from fruits.config import FRUIT_EMOJIS, CSV_FILE, DB_FILE, STORAGE_BACKEND
 from fruits.storage import backup_csv_once, load_answers, append_answer
 from fruits.questions import QUESTIONS
 
@@ -46,7 +46,8 @@ def cmd_fruits() -> None:
             print(f"{emoji} Antwort gespeichert. Fortfahren mit `ff`. {emoji}")
             return
     
-    print(f"✅ Alle Fragen beantwortet! Datei: {CSV_FILE}")
+    data_file = DB_FILE if STORAGE_BACKEND == "sqlite" else CSV_FILE
+    print(f"✅ Alle Fragen beantwortet! Datei: {data_file}")
 
 if __name__ == '__main__':
     cmd_fruits()
\ No newline at end of file
@@ -14,6 +14,10 @@ DATA_DIR: Path = Path(
 CSV_FILE: Path = DATA_DIR / "fruits.csv"
 BACKUP_FILE: Path = CSV_FILE.with_suffix(".bak.csv")
 
+# Speicher-Backend: "csv" (Standard) oder "sqlite"
+STORAGE_BACKEND: str = os.environ.get("FRUITS_BACKEND", "csv").lower()
+DB_FILE: Path = DATA_DIR / "fruits.db"
+
 # Obst-Emojis für CLI-Feedback
 FRUIT_EMOJIS = [
     "🍎", "🍌", "🍇", "🍉", "🍓",
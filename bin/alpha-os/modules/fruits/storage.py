@@ -1,38 +1,149 @@
 #!/usr/bin/env python3
 """
-CSV-Persistence für Fruits-Modul
+Persistenz für Fruits-Modul: CSV (Standard) oder SQLite
+
+Das Backend wählt FRUITS_BACKEND=sqlite; load_answers/append_answer
+bleiben für beide gleich. SQLite hält die aktuelle Antwort pro
+(section, question) plus eine Revisions-Historie und übernimmt beim
+ersten Öffnen einmalig die bestehende fruits.csv.
 """
 from pathlib import Path
+from datetime import datetime
 import csv
 import shutil
-from .config import CSV_FILE, BACKUP_FILE
+import sqlite3
+from .config import CSV_FILE, BACKUP_FILE, DB_FILE, STORAGE_BACKEND
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS answers (
+    section    TEXT NOT NULL,
+    question   TEXT NOT NULL,
+    answer     TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (section, question)
+);
+CREATE INDEX IF NOT EXISTS answers_question ON answers (question);
+CREATE TABLE IF NOT EXISTS answer_history (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    section     TEXT NOT NULL,
+    question    TEXT NOT NULL,
+    answer      TEXT NOT NULL,
+    recorded_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS answer_history_question ON answer_history (section, question);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+_connection: sqlite3.Connection | None = None
 
 def _ensure_parent(path: Path) -> None:
     """Stellt sicher, dass das Verzeichnis existiert"""
     path.parent.mkdir(parents=True, exist_ok=True)
 
+def _use_sqlite() -> bool:
+    return STORAGE_BACKEND == "sqlite"
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
 def backup_csv_once() -> None:
     """Einmaliges Backup der fruits.csv"""
     if CSV_FILE.exists() and not BACKUP_FILE.exists():
         _ensure_parent(BACKUP_FILE)
         shutil.copy2(CSV_FILE, BACKUP_FILE)
 
-def load_answers() -> dict[str, str]:
-    """Lädt alle vorhandenen Antworten aus der CSV"""
+def _read_csv() -> list[dict[str, str]]:
+    """Alle Zeilen der CSV in Dateireihenfolge"""
     if not CSV_FILE.exists():
-        return {}
-    
+        return []
+
     with CSV_FILE.open(newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        return {row['question']: row['answer'] for row in reader if row.get('answer')}
+        return list(csv.DictReader(f))
+
+# --- SQLite ---
+
+def _connect() -> sqlite3.Connection:
+    """Öffnet die Datenbank (einmal pro Prozess) und migriert ggf. die CSV"""
+    global _connection
+    if _connection is None:
+        _ensure_parent(DB_FILE)
+        _connection = sqlite3.connect(DB_FILE)
+        _connection.executescript(_SCHEMA)
+        migrate_csv(_connection)
+    return _connection
+
+def _store(conn: sqlite3.Connection, section: str, question: str, answer: str, at: str) -> None:
+    """Neue Revision in die Historie, aktuelle Antwort ersetzen"""
+    conn.execute(
+        "INSERT INTO answer_history (section, question, answer, recorded_at) VALUES (?, ?, ?, ?)",
+        (section, question, answer, at),
+    )
+    conn.execute(
+        "INSERT INTO answers (section, question, answer, updated_at) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT (section, question) DO UPDATE SET answer = excluded.answer, updated_at = excluded.updated_at",
+        (section, question, answer, at),
+    )
+
+def migrate_csv(conn: sqlite3.Connection | None = None) -> int:
+    """Übernimmt die fruits.csv einmalig in SQLite; gibt die Zahl der Zeilen zurück
+
+    Mehrfach beantwortete Fragen landen in Dateireihenfolge in der
+    Historie, die letzte Antwort gilt (wie beim CSV-Backend).
+    """
+    conn = conn or _connect()
+    if conn.execute("SELECT 1 FROM meta WHERE key = 'csv_migrated'").fetchone():
+        return 0
+
+    rows = [row for row in _read_csv() if row.get('answer')]
+    at = _now()
+    with conn:
+        for row in rows:
+            _store(conn, row.get('section') or '', row['question'], row['answer'], at)
+        conn.execute("INSERT INTO meta (key, value) VALUES ('csv_migrated', ?)", (at,))
+    return len(rows)
+
+def answer_history(section: str, question: str) -> list[tuple[str, str]]:
+    """Alle Revisionen einer Frage als (recorded_at, answer), älteste zuerst (nur SQLite)"""
+    rows = _connect().execute(
+        "SELECT recorded_at, answer FROM answer_history WHERE section = ? AND question = ? ORDER BY id",
+        (section, question),
+    )
+    return rows.fetchall()
+
+# --- Gemeinsame API ---
+
+def load_answers(section: str | None = None) -> dict[str, str]:
+    """Lädt alle vorhandenen Antworten, optional nur die einer Sektion"""
+    if _use_sqlite():
+        if section is None:
+            rows = _connect().execute("SELECT question, answer FROM answers WHERE answer != ''")
+        else:
+            rows = _connect().execute(
+                "SELECT question, answer FROM answers WHERE section = ? AND answer != ''", (section,)
+            )
+        return dict(rows.fetchall())
+
+    return {
+        row['question']: row['answer'] for row in _read_csv()
+        if row.get('answer') and (section is None or row.get('section') == section)
+    }
 
 def append_answer(section: str, question: str, answer: str) -> None:
-    """Hängt eine Antwort an die CSV an"""
+    """Speichert eine Antwort (CSV: anhängen, SQLite: neue Revision)"""
+    if _use_sqlite():
+        conn = _connect()
+        with conn:
+            _store(conn, section, question, answer, _now())
+        return
+
     _ensure_parent(CSV_FILE)
     write_header = not CSV_FILE.exists() or CSV_FILE.stat().st_size == 0
-    
+
     with CSV_FILE.open('a', newline='', encoding='utf-8') as f:
         writer = csv.DictWriter(f, fieldnames=['section','question','answer'], lineterminator='\n')
         if write_header:
             writer.writeheader()
-        writer.writerow({'section': section, 'question': question, 'answer': answer})
\ No newline at end of file
+        writer.writerow({'section': section, 'question': question, 'answer': answer})
@@ -0,0 +1,213 @@
+#!/usr/bin/env python
+"""
+Offline latency benchmark for waybar-wttr.py
+
+Usage:
+    bench-waybar-wttr.py [--budget MS] [--runs N] [--latency MS] [--json]
+    bench-waybar-wttr.py --record LOCATION
+
+Serves the recorded j1 payloads in fixtures/wttr/ from a local HTTP
+stand-in for wttr.in (GET /<location>?format=j1 → fixtures/wttr/<location>.json,
+Firozpur.json for unknown locations) and reports:
+
+    startup    bare interpreter, as a reference
+    cached     waybar-wttr.py in a fresh interpreter with a fresh cache,
+               i.e. what every waybar poll costs; held to --budget
+    uncached   the same with an empty cache, fetching from the stand-in
+    stages     fetch, cache read, parse, render (cold and cached rows)
+               and JSON encoding, timed in-process
+
+--latency adds a sleep per request to the stand-in. The fetch stages need
+requests and are skipped without it. --record saves the live wttr.in
+payload for LOCATION as a new fixture.
+"""
+
+import importlib.util
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+WTTR_SCRIPT = SCRIPTS_DIR / 'waybar-wttr.py'
+FIXTURES_DIR = SCRIPTS_DIR / 'fixtures' / 'wttr'
+DEFAULT_FIXTURE = 'Firozpur'
+
+# Median wall time of one cached waybar poll, interpreter startup included
+BUDGET_MS = 100
+RUNS = 10
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+
+    def do_GET(self):
+        if self.latency:
+            time.sleep(self.latency)
+        location = unquote(urlsplit(self.path).path.strip('/'))
+        fixture = FIXTURES_DIR / f"{location}.json"
+        if not fixture.is_file() or fixture.parent != FIXTURES_DIR:
+            fixture = FIXTURES_DIR / f"{DEFAULT_FIXTURE}.json"
+
+        body = fixture.read_bytes()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def load_wttr_module():
+    """Import waybar-wttr.py without running main"""
+    spec = importlib.util.spec_from_file_location('waybar_wttr', WTTR_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def median_ms(func, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def run_script(args, env):
+    subprocess.run([sys.executable, *args], env=env, check=True, stdout=subprocess.DEVNULL)
+
+
+def bench_end_to_end(url, cache_home, runs):
+    """Median wall times of fresh interpreters, in ms"""
+    env = dict(os.environ, XDG_CACHE_HOME=str(cache_home), WTTR_URL=url)
+    cache_dir = cache_home / 'waybar-wttr'
+    fixture = FIXTURES_DIR / f"{DEFAULT_FIXTURE}.json"
+
+    def cached():
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        shutil.copy(fixture, cache_dir / fixture.name)
+        os.utime(cache_dir / fixture.name)
+        run_script([str(WTTR_SCRIPT), DEFAULT_FIXTURE], env)
+
+    def uncached():
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        run_script([str(WTTR_SCRIPT), DEFAULT_FIXTURE], env)
+
+    results = {
+        'startup': median_ms(lambda: run_script(['-c', 'pass'], env), runs),
+        'cached': median_ms(cached, runs),
+    }
+    if has_requests():
+        results['uncached'] = median_ms(uncached, runs)
+    return results
+
+
+def bench_stages(wttr, cache_home, runs):
+    """Median in-process cost per stage, in ms"""
+    path = cache_home / 'waybar-wttr' / f"{DEFAULT_FIXTURE}.json"
+    weather = json.loads((FIXTURES_DIR / f"{DEFAULT_FIXTURE}.json").read_text())
+    wttr.write_cache(path, weather)
+    forecast = wttr.parse(weather)
+
+    def render_cold():
+        wttr.format_hour.cache_clear()
+        wttr.render(forecast)
+
+    results = {}
+    if has_requests():
+        import requests
+
+        session = requests.Session()
+        results['fetch'] = median_ms(lambda: wttr.fetch_weather(DEFAULT_FIXTURE), runs)
+        results['fetch (session)'] = median_ms(lambda: wttr.fetch_weather(DEFAULT_FIXTURE, session), runs)
+    results['read cache'] = median_ms(lambda: wttr.read_cache(path), runs)
+    results['parse'] = median_ms(lambda: wttr.parse(weather), runs)
+    results['render'] = median_ms(render_cold, runs)
+    results['render (cached rows)'] = median_ms(lambda: wttr.render(forecast), runs)
+    output = wttr.render(forecast)
+    results['json'] = median_ms(lambda: json.dumps(output), runs)
+    return results
+
+
+def has_requests():
+    return importlib.util.find_spec('requests') is not None
+
+
+def record(location):
+    wttr = load_wttr_module()
+    weather = wttr.fetch_weather(location)
+    FIXTURES_DIR.mkdir(parents=True, exist_ok=True)
+    path = FIXTURES_DIR / f"{location}.json"
+    with open(path, 'w') as f:
+        json.dump(weather, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+    print(f"Recorded {location} → {path}")
+    return 0
+
+
+def main():
+    if '--record' in sys.argv:
+        return record(sys.argv[sys.argv.index('--record') + 1])
+
+    budget = BUDGET_MS
+    if '--budget' in sys.argv:
+        budget = float(sys.argv[sys.argv.index('--budget') + 1])
+    runs = RUNS
+    if '--runs' in sys.argv:
+        runs = int(sys.argv[sys.argv.index('--runs') + 1])
+    if '--latency' in sys.argv:
+        FixtureHandler.latency = float(sys.argv[sys.argv.index('--latency') + 1]) / 1000
+    as_json = '--json' in sys.argv
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}"
+
+    # The module reads these at import time
+    os.environ['WTTR_URL'] = url
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_home = Path(tmp)
+        os.environ['XDG_CACHE_HOME'] = str(cache_home)
+        wttr = load_wttr_module()
+        end_to_end = bench_end_to_end(url, cache_home, runs)
+        stages = bench_stages(wttr, cache_home, runs)
+    server.shutdown()
+
+    report = {
+        'budget_ms': budget,
+        'latency_ms': FixtureHandler.latency * 1000,
+        'end_to_end': end_to_end,
+        'stages': stages,
+    }
+    ok = end_to_end['cached'] <= budget
+
+    if as_json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"waybar-wttr benchmark (budget {budget:.0f} ms, {runs} runs, "
+              f"{FixtureHandler.latency * 1000:.0f} ms stand-in latency)")
+        for name, elapsed in end_to_end.items():
+            mark = ('✓' if ok else '✗') if name == 'cached' else ' '
+            print(f"  {mark} {name:<22} {elapsed:>8.2f} ms")
+        if not has_requests():
+            print("    uncached/fetch skipped: requests not installed")
+        for name, elapsed in stages.items():
+            print(f"    {name:<22} {elapsed:>8.3f} ms")
+
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
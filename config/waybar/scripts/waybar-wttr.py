@@ -1,8 +1,44 @@
 #!/usr/bin/env python
+"""
+wttr.in weather module for waybar
 
+Usage:
+    waybar-wttr.py [LOCATION] [--daemon] [--days N] [--hours N]
+
+LOCATION is anything wttr.in accepts (a city, an airport code, ~Landmark);
+it defaults to $WTTR_LOCATION, then Firozpur. Every location has its own
+cache file, and instances on several bars share it: fetches go through a
+per-location lock file, so one request per location serves all of them.
+
+--days and --hours trim the tooltip to that many forecast days and to
+hourly rows within that many hours from now (default: all three days).
+
+The work is split into fetch_weather() → parse() → render(), which
+bench-waybar-wttr.py times against recorded payloads in fixtures/wttr/;
+$WTTR_URL points the fetch at another server.
+"""
+
+import fcntl
+import functools
 import json
-import requests
+import os
+import re
+import subprocess
+import sys
+import time
 from datetime import datetime
+from pathlib import Path
+from urllib.parse import quote
+
+# Cached j1 payload is served as-is while younger than CACHE_TTL seconds;
+# older copies are still shown while a detached process refreshes them.
+CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME', Path.home() / '.cache')) / 'waybar-wttr'
+CACHE_TTL = 15 * 60
+FETCH_TIMEOUT = 10
+WTTR_URL = os.environ.get('WTTR_URL', 'https://wttr.in').rstrip('/')
+DEFAULT_LOCATION = 'Firozpur'
+# --daemon: seconds between re-renders (a new line is printed only on change)
+DAEMON_TICK = 60
 
 WEATHER_CODES = {
     '113': '☀️ ',
@@ -55,11 +91,113 @@ WEATHER_CODES = {
     '395': '❄️ '
 }
 
-data = {}
 
-city = "Firozpur"
+def get_option(argv, name):
+    if name in argv:
+        return int(argv[argv.index(name) + 1])
+    return None
+
+
+def get_location(argv):
+    args = [
+        arg for i, arg in enumerate(argv[1:], 1)
+        if not arg.startswith('--') and argv[i - 1] not in ('--days', '--hours')
+    ]
+    return args[0] if args else os.environ.get('WTTR_LOCATION') or DEFAULT_LOCATION
+
+
+def cache_path(city):
+    return CACHE_DIR / (re.sub(r'[^\w.@~+-]', '_', city) + '.json')
+
+
+def fetch_weather(city, session=None):
+    if session is None:
+        import requests
+        session = requests
+
+    response = session.get(f"{WTTR_URL}/{quote(city)}?format=j1", timeout=FETCH_TIMEOUT)
+    response.raise_for_status()
+    return response.json()
+
+
+def read_cache(path):
+    try:
+        with open(path) as f:
+            return json.load(f), time.time() - path.stat().st_mtime
+    except (OSError, ValueError):
+        return None, None
+
+
+def write_cache(path, weather):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix('.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(weather, f)
+    os.replace(tmp, path)
+
+
+def cache_mtime(path):
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return None
+
+
+def refresh_cache(city, path, session=None, wait=True):
+    """Fetch into the cache unless another instance is doing it or just did
+
+    The fetch runs under an exclusive lock on <cache>.lock. An instance
+    that finds the lock taken waits for it (or gives up, with wait=False)
+    and then uses the payload the lock holder wrote if it is fresh.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_suffix('.lock'), 'w') as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | (0 if wait else fcntl.LOCK_NB))
+        except BlockingIOError:
+            return None
+
+        weather, age = read_cache(path)
+        if weather is not None and age <= CACHE_TTL:
+            return weather
+
+        try:
+            weather = fetch_weather(city, session)
+        except Exception as e:
+            print(f"waybar-wttr: fetch failed for {city}: {e}", file=sys.stderr)
+            return None
+        write_cache(path, weather)
+        return weather
+
+
+def refresh_in_background(city):
+    """Re-run this script detached with --refresh, so waybar isn't kept waiting"""
+    subprocess.Popen(
+        [sys.executable, __file__, city, '--refresh'],
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
 
-weather = requests.get("https://wttr.in/Firozpur?format=j1").json()
+def get_weather(city, path):
+    weather, age = read_cache(path)
+    if weather is None:
+        return refresh_cache(city, path)
+    if age > CACHE_TTL:
+        refresh_in_background(city)
+    return weather
+
+
+CHANCES = (
+    ("chanceoffog", "Fog"),
+    ("chanceoffrost", "Frost"),
+    ("chanceofovercast", "Overcast"),
+    ("chanceofrain", "Rain"),
+    ("chanceofsnow", "Snow"),
+    ("chanceofsunshine", "Sunshine"),
+    ("chanceofthunder", "Thunder"),
+    ("chanceofwindy", "Wind"),
+)
 
 
 def format_time(time):
@@ -67,54 +205,141 @@ def format_time(time):
 
 
 def format_temp(temp):
-    return (hour['FeelsLikeC']+"°").ljust(3)
-
-
-def format_chances(hour):
-    chances = {
-        "chanceoffog": "Fog",
-        "chanceoffrost": "Frost",
-        "chanceofovercast": "Overcast",
-        "chanceofrain": "Rain",
-        "chanceofsnow": "Snow",
-        "chanceofsunshine": "Sunshine",
-        "chanceofthunder": "Thunder",
-        "chanceofwindy": "Wind"
+    return (temp+"°").ljust(3)
+
+
+def parse(weather):
+    """Reduce a j1 payload to the fields the module shows, once per payload
+
+    Hourly slots become (hour, label, code, feels like, description,
+    chances) tuples, chances being the non-zero (name, percent) pairs.
+    """
+    current = weather['current_condition'][0]
+    days = []
+    for day in weather['weather']:
+        hours = []
+        for hour in day['hourly']:
+            label = format_time(hour['time'])
+            chances = tuple((name, hour[key]) for key, name in CHANCES if int(hour[key]) > 0)
+            hours.append((int(label), label, hour['weatherCode'], hour['FeelsLikeC'],
+                          hour['weatherDesc'][0]['value'], chances))
+        days.append({
+            'date': day['date'],
+            'max': day['maxtempC'],
+            'min': day['mintempC'],
+            'sunrise': day['astronomy'][0]['sunrise'],
+            'sunset': day['astronomy'][0]['sunset'],
+            'hours': hours,
+        })
+    return {
+        'code': current['weatherCode'],
+        'desc': current['weatherDesc'][0]['value'],
+        'temp': current['temp_C'],
+        'feels': current['FeelsLikeC'],
+        'wind': current['windspeedKmph'],
+        'humidity': current['humidity'],
+        'days': days,
     }
 
-    conditions = []
-    for event in chances.keys():
-        if int(hour[event]) > 0:
-            conditions.append(chances[event]+" "+hour[event]+"%")
-    return ", ".join(conditions)
-
-tempint = int(weather['current_condition'][0]['FeelsLikeC'])
-extrachar = ''
-if tempint > 0 and tempint < 10:
-    extrachar = '+'
-
-
-data['text'] = ' '+WEATHER_CODES[weather['current_condition'][0]['weatherCode']] + \
-    " "+extrachar+weather['current_condition'][0]['FeelsLikeC']+"°C"
-
-data['tooltip'] = f"<b>{weather['current_condition'][0]['weatherDesc'][0]['value']} {weather['current_condition'][0]['temp_C']}°</b>\n"
-data['tooltip'] += f"Feels like: {weather['current_condition'][0]['FeelsLikeC']}°\n"
-data['tooltip'] += f"Wind: {weather['current_condition'][0]['windspeedKmph']}Km/h\n"
-data['tooltip'] += f"Humidity: {weather['current_condition'][0]['humidity']}%\n"
-for i, day in enumerate(weather['weather']):
-    data['tooltip'] += f"\n<b>"
-    if i == 0:
-        data['tooltip'] += "Today, "
-    if i == 1:
-        data['tooltip'] += "Tomorrow, "
-    data['tooltip'] += f"{day['date']}</b>\n"
-    data['tooltip'] += f"⬆️ {day['maxtempC']}° ⬇️ {day['mintempC']}° "
-    data['tooltip'] += f"🌅 {day['astronomy'][0]['sunrise']} 🌇 {day['astronomy'][0]['sunset']}\n"
-    for hour in day['hourly']:
-        if i == 0:
-            if int(format_time(hour['time'])) < datetime.now().hour-2:
+
+@functools.lru_cache(maxsize=512)
+def format_hour(label, code, feels, desc, chances):
+    """One tooltip row; cached on content, so unchanged forecasts aren't reformatted"""
+    conditions = ", ".join(f"{name} {percent}%" for name, percent in chances)
+    return f"{label} {WEATHER_CODES[code]} {format_temp(feels)} {desc}, {conditions}\n"
+
+
+def unavailable(city):
+    return {'text': ' ❓', 'class': 'error', 'tooltip': f"Weather for {city} unavailable"}
+
+
+def render(forecast, days=None, hours=None, now=None):
+    """Waybar JSON for a parsed forecast
+
+    days limits the forecast days shown, hours the hourly rows to those
+    starting within that many hours from now.
+    """
+    now = now or datetime.now()
+    earliest = now.hour - 2
+    latest = now.hour + hours if hours is not None else None
+
+    feels = forecast['feels']
+    extrachar = '+' if 0 < int(feels) < 10 else ''
+    text = '\u2009'+WEATHER_CODES[forecast['code']]+" "+extrachar+feels+"°C"
+
+    parts = [
+        f"<b>{forecast['desc']} {forecast['temp']}°</b>\n",
+        f"Feels like: {feels}°\n",
+        f"Wind: {forecast['wind']}Km/h\n",
+        f"Humidity: {forecast['humidity']}%\n",
+    ]
+    for i, day in enumerate(forecast['days'][:days]):
+        if latest is not None and latest < 24 * i:
+            break
+        label = ("Today, ", "Tomorrow, ")[i] if i < 2 else ""
+        parts.append(f"\n<b>{label}{day['date']}</b>\n")
+        parts.append(f"⬆️ {day['max']}° ⬇️ {day['min']}° 🌅 {day['sunrise']} 🌇 {day['sunset']}\n")
+        for hour, *row in day['hours']:
+            if i == 0 and hour < earliest:
                 continue
-        data['tooltip'] += f"{format_time(hour['time'])} {WEATHER_CODES[hour['weatherCode']]} {format_temp(hour['FeelsLikeC'])} {hour['weatherDesc'][0]['value']}, {format_chances(hour)}\n"
+            if latest is not None and 24 * i + hour > latest:
+                break
+            parts.append(format_hour(*row))
+
+    return {'text': text, 'tooltip': ''.join(parts)}
+
+
+def run_daemon(city, path, days=None, hours=None):
+    """Keep one HTTP session, refresh every CACHE_TTL and print a line only on change
+
+    For waybar's continuous mode: "exec": "waybar-wttr.py --daemon" without
+    "interval". The tooltip is re-rendered every DAEMON_TICK seconds, since
+    the hours shown for today move with the clock.
+    """
+    import requests
+
+    session = requests.Session()
+    weather = forecast = loaded_mtime = last_output = None
+    while True:
+        # Pick up payloads written by other instances, fetch when stale
+        mtime = cache_mtime(path)
+        if mtime is not None and mtime != loaded_mtime:
+            weather = read_cache(path)[0] or weather
+            loaded_mtime = mtime
+        if mtime is None or time.time() - mtime > CACHE_TTL:
+            weather = refresh_cache(city, path, session) or weather
+            loaded_mtime = cache_mtime(path)
+        if weather is not None and (forecast is None or forecast[0] is not weather):
+            forecast = (weather, parse(weather))
+
+        output = json.dumps(render(forecast[1], days, hours) if forecast else unavailable(city))
+        if output != last_output:
+            print(output, flush=True)
+            last_output = output
+
+        time.sleep(DAEMON_TICK)
+
+
+def main(argv):
+    city = get_location(argv)
+    cache_file = cache_path(city)
+    days = get_option(argv, '--days')
+    hours = get_option(argv, '--hours')
+
+    if '--refresh' in argv:
+        return 0 if refresh_cache(city, cache_file, wait=False) else 1
+
+    if '--daemon' in argv:
+        try:
+            run_daemon(city, cache_file, days, hours)
+        except (KeyboardInterrupt, BrokenPipeError):
+            pass
+        return 0
+
+    weather = get_weather(city, cache_file)
+    print(json.dumps(render(parse(weather), days, hours) if weather else unavailable(city)))
+    return 0
 
 
-print(json.dumps(data))
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
@@ -0,0 +1,546 @@
+#!/usr/bin/env python3
+"""
+ClaudeWarrior: Offline benchmark for the Taskwarrior → Google Calendar sync
+Runs sync_tasks_to_gcal() against synthetic task databases and an
+in-process stand-in for the Calendar v3 events resource, no Google account
+or Taskwarrior install needed
+
+Usage:
+    bench-tw-gcal.py [--sizes 100,1000,10000] [--batch] [--latency MS]
+                     [--no-memory] [--json] [--baseline FILE]
+
+Each size runs four scenarios:
+    cold    first sync into empty calendars
+    warm    immediate re-run with nothing changed
+    steady  --since-last run after a day of edits (5% edited, 1% done, 1% new)
+            and of renames in the calendar (5% of the events)
+    pull    --since-last --pull run; must bring back every calendar rename
+            the steady run did not overwrite with a newer local edit
+
+API calls and HTTP round trips are counted on the fake server side, so
+they are exact and deterministic. --latency adds a sleep per round trip to
+model the network. Peak memory comes from tracemalloc, which slows the
+sync down; pass --no-memory for cleaner wall times. --baseline compares
+against a saved --json report and fails if any run makes more API calls.
+"""
+
+import contextlib
+import copy
+import importlib.util
+import io
+import json
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+SYNC_SCRIPT = SCRIPTS_DIR / 'sync-tw-gcal.py'
+
+DEFAULT_SIZES = [100, 1000, 10000]
+SEED = 42
+LIST_PAGE_SIZE = 2500
+
+# Synthetic task mix, roughly what a real AlphaOS task list looks like
+FIRE_RATIO = 0.15
+DUE_RATIO = 0.7
+DOMAINS = ['body', 'being', 'balance', 'business', None]
+DOMAIN_WEIGHTS = [2, 2, 1, 3, 2]
+PILLARS = ['code', 'core', 'voice', 'door', 'game', None]
+PROJECTS = ['alphaos', 'dotfiles', 'health', 'finance', 'home', None]
+EXTRA_TAGS = ['next', 'waiting', 'someday', 'errand', 'call']
+
+# Steady state: share of the database touched between two syncs
+EDIT_RATIO = 0.05
+DONE_RATIO = 0.01
+NEW_RATIO = 0.01
+
+BENCH_CONFIG = {
+    'google_calendar': {
+        'enabled': True,
+        'default_cal_id': 'primary',
+        'fire_map_cal_id': 'fire-map',
+        'trainingsplan_cal_id': 'trainingsplan',
+        'being_cal_id': 'being',
+        'balance_cal_id': 'balance',
+        'business_cal_id': 'business',
+        # The fake has no quota; measure the client, not the limiter
+        'rate_limit_qps': 1e9,
+        'rate_limit_burst': 1e9,
+    }
+}
+
+
+def load_sync_module():
+    """Import sync-tw-gcal.py as a module without running main"""
+    spec = importlib.util.spec_from_file_location('sync_tw_gcal', SYNC_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# Fake Calendar v3 API
+class FakeHttpError(Exception):
+    """Shaped like googleapiclient's HttpError as far as the sync cares"""
+
+    def __init__(self, status, reason):
+        super().__init__(f"<HttpError {status}: {reason}>")
+        self.resp = type('Response', (), {'status': status})()
+
+
+class FakeRequest:
+    """One events.<method> call, executed directly or inside a batch"""
+
+    def __init__(self, service, method, handler):
+        self.service = service
+        self.method = method
+        self.handler = handler
+
+    def execute(self, http=None):
+        self.service.round_trip()
+        return self.call()
+
+    def call(self):
+        self.service.count_call(self.method)
+        return self.handler()
+
+
+class FakeBatch:
+    """BatchHttpRequest stand-in: one round trip, callback per sub-request"""
+
+    def __init__(self, service, callback):
+        self.service = service
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, request_id=None):
+        self.requests.append((request_id, request))
+
+    def execute(self, http=None):
+        self.service.round_trip()
+        for request_id, request in self.requests:
+            try:
+                self.callback(request_id, request.call(), None)
+            except FakeHttpError as e:
+                self.callback(request_id, None, e)
+
+
+class FakeEvents:
+    """The events resource: list (with syncToken), insert, patch, delete, move"""
+
+    def __init__(self, service):
+        self.service = service
+
+    def _request(self, method, handler):
+        return FakeRequest(self.service, method, handler)
+
+    def list(self, calendarId, pageToken=None, maxResults=LIST_PAGE_SIZE,
+             syncToken=None, showDeleted=True, **params):
+        return self._request('list', lambda: self.service.list_events(
+            calendarId, int(pageToken or 0), maxResults, syncToken, showDeleted
+        ))
+
+    def insert(self, calendarId, body, **params):
+        return self._request('insert', lambda: self.service.store_event(
+            calendarId, dict(copy.deepcopy(body), id=self.service.new_id())
+        ))
+
+    def patch(self, calendarId, eventId, body, **params):
+        def handler():
+            event = copy.deepcopy(self.service.get_event(calendarId, eventId))
+            merge_patch(event, body)
+            validate_times(event)
+            return self.service.store_event(calendarId, event)
+        return self._request('patch', handler)
+
+    def delete(self, calendarId, eventId, **params):
+        def handler():
+            self.service.drop_event(calendarId, eventId)
+            return ''
+        return self._request('delete', handler)
+
+    def move(self, calendarId, eventId, destination, **params):
+        def handler():
+            event = self.service.drop_event(calendarId, eventId)
+            return self.service.store_event(destination, event)
+        return self._request('move', handler)
+
+
+def merge_patch(target, patch):
+    """Patch semantics of the API: objects merge key by key, null clears"""
+    for field, value in patch.items():
+        if value is None:
+            target.pop(field, None)
+        elif isinstance(value, dict) and isinstance(target.get(field), dict):
+            merge_patch(target[field], value)
+        else:
+            target[field] = copy.deepcopy(value)
+
+
+def validate_times(event):
+    """Reject start/end with both or neither of date and dateTime, like the API"""
+    for field in ('start', 'end'):
+        value = event.get(field, {})
+        if ('date' in value) == ('dateTime' in value):
+            raise FakeHttpError(400, 'invalid')
+
+
+class FakeCalendarService:
+    """In-process Calendar v3 service with call and round-trip counters
+
+    Every change bumps a per-service sequence number; sync tokens are the
+    sequence at list time, so delta listings return exactly the events
+    changed since, cancelled ones included.
+    """
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calendars = {}
+        self.sequence = 0
+        self.next_id = 0
+        self.calls = {}
+        self.round_trips = 0
+        self.lock = threading.Lock()
+
+    def events(self):
+        return FakeEvents(self)
+
+    def new_batch_http_request(self, callback):
+        return FakeBatch(self, callback)
+
+    def rename_events(self, count, rng, uuid_property):
+        """Calendar-side edits, as if made in the Google Calendar UI; returns their task uuids"""
+        with self.lock:
+            events = [
+                (cal_id, event) for cal_id, events in sorted(self.calendars.items())
+                for event in events.values() if event.get('status') != 'cancelled'
+            ]
+        renamed = set()
+        for cal_id, event in rng.sample(events, min(count, len(events))):
+            event = copy.deepcopy(event)
+            event['summary'] += ' (renamed)'
+            self.store_event(cal_id, event)
+            renamed.add(event['extendedProperties']['private'][uuid_property])
+        return renamed
+
+    def round_trip(self):
+        with self.lock:
+            self.round_trips += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def count_call(self, method):
+        with self.lock:
+            self.calls[method] = self.calls.get(method, 0) + 1
+
+    def reset_counters(self):
+        with self.lock:
+            self.calls = {}
+            self.round_trips = 0
+
+    def new_id(self):
+        with self.lock:
+            self.next_id += 1
+            return f'evt{self.next_id:08d}'
+
+    def get_event(self, cal_id, event_id):
+        with self.lock:
+            event = self.calendars.get(cal_id, {}).get(event_id)
+            if event is None or event.get('status') == 'cancelled':
+                raise FakeHttpError(404, 'notFound')
+            return event
+
+    def store_event(self, cal_id, event):
+        with self.lock:
+            self.sequence += 1
+            event['status'] = 'confirmed'
+            event['etag'] = f'"{self.sequence}"'
+            event['updated'] = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+            event['_sequence'] = self.sequence
+            self.calendars.setdefault(cal_id, {})[event['id']] = event
+            return public_event(event)
+
+    def drop_event(self, cal_id, event_id):
+        event = self.get_event(cal_id, event_id)
+        with self.lock:
+            self.sequence += 1
+            self.calendars[cal_id][event_id] = {
+                'id': event_id, 'status': 'cancelled', '_sequence': self.sequence,
+                'extendedProperties': event.get('extendedProperties', {}),
+            }
+            return copy.deepcopy(event)
+
+    def list_events(self, cal_id, offset, page_size, sync_token, show_deleted):
+        with self.lock:
+            events = sorted(
+                self.calendars.get(cal_id, {}).values(), key=lambda e: e['_sequence']
+            )
+            if sync_token:
+                events = [e for e in events if e['_sequence'] > int(sync_token)]
+            elif not show_deleted:
+                events = [e for e in events if e.get('status') != 'cancelled']
+
+            result = {'items': [public_event(e) for e in events[offset:offset + page_size]]}
+            if offset + page_size < len(events):
+                result['nextPageToken'] = str(offset + page_size)
+            else:
+                result['nextSyncToken'] = str(self.sequence)
+            return result
+
+
+def public_event(event):
+    """Copy of a stored event as the API would return it"""
+    return {k: copy.deepcopy(v) for k, v in event.items() if not k.startswith('_')}
+
+
+# Synthetic Taskwarrior database
+class SyntheticTasks:
+    """Pending tasks kept as `task export` lines, with a day of edits"""
+
+    def __init__(self, count, seed=SEED):
+        self.rng = random.Random(seed)
+        self.now = datetime.now(timezone.utc).replace(microsecond=0)
+        self.tasks = {}
+        for _ in range(count):
+            task = self.new_task(self.now - timedelta(days=2))
+            self.tasks[task['uuid']] = task
+        self.lines = {}
+        self.imported = 0
+        self.refresh_lines()
+
+    def new_task(self, modified):
+        rng = self.rng
+        number = len(self.tasks) + 1
+        task = {
+            'uuid': str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            'id': number,
+            'description': f"Synthetic task {number}",
+            'status': 'pending',
+            'entry': format_date(modified),
+            'modified': format_date(modified),
+        }
+
+        tags = rng.sample(EXTRA_TAGS, rng.randint(0, 2))
+        if rng.random() < FIRE_RATIO:
+            tags.append('fire')
+        if tags:
+            task['tags'] = tags
+        if rng.random() < DUE_RATIO:
+            task['due'] = format_date(self.random_due())
+
+        for field, values, weights in (
+            ('domain', DOMAINS, DOMAIN_WEIGHTS),
+            ('pillar', PILLARS, None),
+            ('project', PROJECTS, None),
+        ):
+            value = rng.choices(values, weights)[0]
+            if value:
+                task[field] = value
+        return task
+
+    def random_due(self):
+        day = self.now + timedelta(days=self.rng.randint(-3, 30))
+        return day.replace(hour=self.rng.randint(6, 21), minute=self.rng.choice([0, 15, 30, 45]), second=0)
+
+    def refresh_lines(self):
+        self.lines = {uuid: json.dumps(task) for uuid, task in self.tasks.items()}
+
+    def day_of_edits(self):
+        """Edit, complete and add tasks the way a normal day would"""
+        rng = self.rng
+        touched = datetime.now(timezone.utc).replace(microsecond=0) + timedelta(seconds=1)
+        pending = [task for task in self.tasks.values() if task['status'] == 'pending']
+        count = len(pending)
+
+        for task in rng.sample(pending, int(count * EDIT_RATIO)):
+            if task.get('due') and rng.random() < 0.5:
+                task['due'] = format_date(self.random_due())
+            else:
+                task['description'] += ' (edited)'
+            task['modified'] = format_date(touched)
+
+        pending = [task for task in pending if task['modified'] != format_date(touched)]
+        for task in rng.sample(pending, int(count * DONE_RATIO)):
+            task['status'] = 'completed'
+            task['end'] = task['modified'] = format_date(touched)
+
+        for _ in range(max(1, int(count * NEW_RATIO))):
+            task = self.new_task(touched)
+            self.tasks[task['uuid']] = task
+
+        self.refresh_lines()
+
+    def import_(self, sync, tasks):
+        """Stand-in for import_tasks(): write the tasks back as export lines"""
+        for task in tasks:
+            record = dict(task)
+            for field in sync.TW_DATE_FIELDS:
+                if field in record:
+                    record[field] = format_date(record[field])
+            self.tasks[record['uuid']] = record
+            self.imported += 1
+        self.refresh_lines()
+
+    def export(self, sync, filters):
+        """Stand-in for export_tasks(): filter, then parse like a real export"""
+        for line in self.lines.values():
+            task = json.loads(line)
+            for field in sync.TW_DATE_FIELDS:
+                if field in task:
+                    task[field] = sync.parse_tw_date(task[field])
+            if matches(task, filters):
+                yield task
+
+
+def format_date(value):
+    return value.astimezone(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def matches(task, filters):
+    """The handful of filter shapes the sync passes to `task export`"""
+    terms = [term for term in filters if term not in ('(', ')', 'or')]
+    for term in terms:
+        if term == task['uuid']:
+            return True
+        attribute, _, value = term.partition(':')
+        if attribute == 'status' and task.get('status') == value:
+            return True
+        if attribute in ('uuid', 'parent') and task.get(attribute) == value:
+            return True
+        if attribute == 'modified.after':
+            watermark = datetime.strptime(value, '%Y%m%dT%H%M%SZ').replace(tzinfo=timezone.utc)
+            return task['modified'] > watermark
+    return not terms
+
+
+# Benchmark runs
+def run_scenario(sync, service, batch, since_last, memory, pull=False):
+    """One sync_tasks_to_gcal() run; wall time, API counters, peak memory"""
+    service.reset_counters()
+    if memory:
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        exit_code = sync.sync_tasks_to_gcal(batch=batch, since_last=since_last, pull=pull)
+    elapsed = time.perf_counter() - started
+
+    result = {
+        'exit_code': exit_code,
+        'wall_ms': round(elapsed * 1000, 1),
+        'api_calls': sum(service.calls.values()),
+        'by_method': dict(sorted(service.calls.items())),
+        'http_requests': service.round_trips,
+    }
+    if memory:
+        result['peak_mb'] = round((tracemalloc.get_traced_memory()[1] - baseline) / 2**20, 2)
+    return result
+
+
+def bench_size(sync, count, batch, latency, memory):
+    """Cold, warm, steady-state and pull runs over one synthetic database"""
+    tasks = SyntheticTasks(count)
+    service = FakeCalendarService(latency)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sync.CONFIG_DIR = Path(tmp)
+        sync.GCAL_STATE_FILE = Path(tmp) / 'gcal_state.json'
+        sync.GCAL_JOURNAL_FILE = Path(tmp) / 'gcal_journal.jsonl'
+        sync.GCAL_METRICS_FILE = Path(tmp) / 'logs' / 'gcal-sync-metrics.jsonl'
+        sync.load_config = lambda: BENCH_CONFIG
+        sync.get_gcal_service = lambda: service
+        sync.export_tasks = lambda filters: tasks.export(sync, filters)
+        sync.import_tasks = lambda updated: tasks.import_(sync, updated)
+
+        results = {}
+        results['cold'] = run_scenario(sync, service, batch, False, memory)
+        results['warm'] = run_scenario(sync, service, batch, False, memory)
+        renamed = service.rename_events(int(count * EDIT_RATIO), tasks.rng, sync.GCAL_UUID_PROPERTY)
+        tasks.day_of_edits()
+        # Let the watermark (run start - 1s) fall behind the edits
+        time.sleep(1.1)
+        results['steady'] = run_scenario(sync, service, batch, True, memory)
+
+        # The steady run consumed the syncToken delta holding the renames;
+        # the pull must still find those no newer local edit overwrote
+        untouched = {uuid for uuid in renamed if tasks.tasks[uuid]['modified'] < format_date(tasks.now)}
+        results['pull'] = run_scenario(sync, service, batch, True, memory, pull=True)
+        results['pull']['pulled'] = tasks.imported
+        if tasks.imported != len(untouched):
+            print(f"  ✗ {count} tasks: pulled {tasks.imported} of {len(untouched)} calendar edits",
+                  file=sys.stderr)
+            results['pull']['exit_code'] = 1
+        return results
+
+
+def compare_baseline(report, baseline_file):
+    """Runs that make more API calls than in the baseline report"""
+    with open(baseline_file) as f:
+        baseline = json.load(f)
+
+    regressions = []
+    for size, runs in report['results'].items():
+        for scenario, result in runs.items():
+            before = baseline.get('results', {}).get(size, {}).get(scenario)
+            if before and result['api_calls'] > before['api_calls']:
+                regressions.append(
+                    f"{size} tasks/{scenario}: {before['api_calls']} → {result['api_calls']} API calls"
+                )
+    return regressions
+
+
+def main():
+    sizes = DEFAULT_SIZES
+    if '--sizes' in sys.argv:
+        sizes = [int(size) for size in sys.argv[sys.argv.index('--sizes') + 1].split(',')]
+    latency = 0.0
+    if '--latency' in sys.argv:
+        latency = float(sys.argv[sys.argv.index('--latency') + 1]) / 1000
+    batch = '--batch' in sys.argv
+    memory = '--no-memory' not in sys.argv
+    as_json = '--json' in sys.argv
+
+    sync = load_sync_module()
+    if memory:
+        tracemalloc.start()
+
+    report = {
+        'mode': 'batch' if batch else 'serial',
+        'latency_ms': latency * 1000,
+        'results': {},
+    }
+    if not as_json:
+        print(f"[ClaudeWarrior] GCal sync benchmark ({report['mode']}, {latency * 1000:.0f} ms per round trip)")
+        print(f"  {'tasks':>6}  {'run':<7} {'wall ms':>9} {'api calls':>10} {'http':>6} {'peak MB':>8}")
+
+    failed = False
+    for count in sizes:
+        results = bench_size(sync, count, batch, latency, memory)
+        report['results'][str(count)] = results
+        for scenario, result in results.items():
+            failed |= result['exit_code'] != 0
+            if not as_json:
+                peak = f"{result['peak_mb']:.2f}" if memory else '-'
+                print(f"  {count:>6}  {scenario:<7} {result['wall_ms']:>9.1f} "
+                      f"{result['api_calls']:>10} {result['http_requests']:>6} {peak:>8}")
+
+    if as_json:
+        print(json.dumps(report, indent=2))
+
+    if '--baseline' in sys.argv:
+        regressions = compare_baseline(report, sys.argv[sys.argv.index('--baseline') + 1])
+        for regression in regressions:
+            print(f"  ✗ {regression}", file=sys.stderr)
+        failed |= bool(regressions)
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+ClaudeWarrior: Cold-start budget check for the integration scripts
+Loads each script in a fresh interpreter and fails when it is over budget
+or pulls in a heavy dependency at import time
+
+Usage:
+    check-startup.py [--budget MS] [--runs N]
+"""
+
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+SCRIPTS = ['sync-tw-gcal.py', 'sync-ticktick-tw.py']
+
+# Total wall time per cold start, interpreter startup included
+STARTUP_BUDGET_MS = 150
+RUNS = 5
+
+# Modules that must only be imported once a sync actually needs them
+HEAVY_MODULES = [
+    'google', 'googleapiclient', 'google_auth_oauthlib', 'httplib2',
+    'tasklib', 'ticktick', 'aiohttp', 'requests',
+]
+
+# Executed in the child: load the script as a module without running main
+LOADER = """
+import importlib.util, json, sys
+spec = importlib.util.spec_from_file_location('script', sys.argv[1])
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+heavy = json.loads(sys.argv[2])
+print(json.dumps(sorted(m for m in sys.modules if m.split('.')[0] in heavy)))
+"""
+
+
+def time_cold_start(args):
+    """Median wall time in ms and the last stdout of a fresh interpreter"""
+    timings = []
+    output = ''
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, *args], capture_output=True, text=True, check=True
+        )
+        timings.append((time.perf_counter() - started) * 1000)
+        output = result.stdout
+    return statistics.median(timings), output
+
+
+def main():
+    global RUNS
+
+    budget = STARTUP_BUDGET_MS
+    if '--budget' in sys.argv:
+        budget = float(sys.argv[sys.argv.index('--budget') + 1])
+    if '--runs' in sys.argv:
+        RUNS = int(sys.argv[sys.argv.index('--runs') + 1])
+
+    baseline, _ = time_cold_start(['-c', 'pass'])
+    print(f"[ClaudeWarrior] Cold-start budget {budget:.0f} ms (interpreter alone: {baseline:.1f} ms)")
+
+    failed = False
+    for name in SCRIPTS:
+        elapsed, output = time_cold_start(
+            ['-c', LOADER, str(SCRIPTS_DIR / name), json.dumps(HEAVY_MODULES)]
+        )
+        heavy = json.loads(output)
+        ok = elapsed <= budget and not heavy
+        failed |= not ok
+
+        mark = '✓' if ok else '✗'
+        print(f"  {mark} {name}: {elapsed:.1f} ms (+{elapsed - baseline:.1f} ms over interpreter)")
+        if heavy:
+            print(f"    heavy modules loaded at import: {', '.join(heavy)}")
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,36 +3,99 @@
 ClaudeWarrior: TickTick → Taskwarrior Import
 Imports tasks from TickTick that are tagged with +claudewarrior
 
+Usage:
+    sync-ticktick-tw.py [--dry-run] [--classifier-stats]
+
+Talks to the TickTick Open API with the OAuth access token from
+~/.config/ticktick/config.json ("access_token"). The API base URL can be
+pointed elsewhere with "api_base" in the ticktick section of config.json
+or TICKTICK_API_BASE, e.g. at ticktick-fixture-server.py for offline runs.
+
+Imported TickTick tasks are remembered in ticktick_state.json (TickTick
+id → task uuid and a hash of the mapped fields), so re-runs skip unchanged
+tasks and update changed ones in place instead of importing duplicates.
+TickTick lists become TickTick.<list name> projects. The project list is
+revalidated on every run (an unchanged list costs a 304), and the cached
+copy stands in for up to a day (ticktick.project_cache_ttl) while the API
+is unreachable.
+
+Domain and pillar are inferred from the task title and content by keyword
+rules (ticktick.classifier_rules in config.json replaces the built-in set);
+--classifier-stats prints how often each rule matched and decided.
+
 Requirements:
-    pip install --user ticktick-py tasklib
+    pip install --user aiohttp
+    task (Taskwarrior CLI) on PATH
 """
 
+import hashlib
 import json
+import os
+import random
+import re
+import subprocess
 import sys
-from datetime import datetime
+import time
+import uuid
+from datetime import datetime, timezone
 from pathlib import Path
 
-# Try importing dependencies
-try:
-    from tasklib import TaskWarrior, Task
-except ImportError:
-    print("ERROR: tasklib not installed. Run: pip install --user tasklib", file=sys.stderr)
-    sys.exit(1)
-
-try:
-    import ticktick
-    from ticktick.oauth2 import OAuth2
-    from ticktick.api import TickTickClient
-    TICKTICK_AVAILABLE = True
-except ImportError:
-    TICKTICK_AVAILABLE = False
-    print("WARNING: ticktick-py not installed. TickTick import disabled.", file=sys.stderr)
-    print("To enable: pip install --user ticktick-py", file=sys.stderr)
+# aiohttp and asyncio are imported lazily where they are used, so a
+# disabled integration never pays for loading them.
 
 # Config
 CONFIG_DIR = Path.home() / ".config" / "claudewarrior"
 CONFIG_FILE = CONFIG_DIR / "config.json"
 TICKTICK_CONFIG = Path.home() / ".config" / "ticktick" / "config.json"
+TICKTICK_STATE_FILE = CONFIG_DIR / "ticktick_state.json"
+CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME', Path.home() / ".cache")) / "claudewarrior"
+TICKTICK_PROJECT_CACHE = CACHE_DIR / "ticktick-projects.json"
+TASK_DATA_DIR = Path.home() / ".task"
+
+# Taskwarrior
+TW_DATE_FORMAT = '%Y%m%dT%H%M%SZ'
+
+# TickTick Open API
+TICKTICK_API_BASE = 'https://api.ticktick.com/open/v1'
+# The inbox is not part of the project list but has a data endpoint
+TICKTICK_INBOX_ID = 'inbox'
+# Connection pool size, which also bounds concurrent project fetches
+TICKTICK_CONCURRENCY = 8
+TICKTICK_TIMEOUT = 30
+TICKTICK_MAX_RETRIES = 3
+TICKTICK_BACKOFF_BASE = 0.5
+# AlphaOS domain/pillar inference. Each rule has keywords (whole words or
+# phrases; a trailing * makes a stem, "meditat*" also matches "meditation")
+# or a regex pattern, and sets a domain and/or pillar; per field the first
+# matching rule in order wins.
+ALPHAOS_DOMAINS = ('body', 'being', 'balance', 'business')
+ALPHAOS_PILLARS = ('code', 'core', 'voice', 'door', 'game')
+DEFAULT_CLASSIFIER_RULES = [
+    {'name': 'game', 'keywords': ['frame map', 'freedom map', 'focus map', 'fire map'], 'pillar': 'game'},
+    {'name': 'door', 'keywords': ['war stack*', 'hot list*', 'hotlist*', 'door war'], 'pillar': 'door'},
+    {'name': 'voice', 'keywords': ['voice session*', 'voice'], 'pillar': 'voice'},
+    {'name': 'code', 'pattern': r'\b(?:the|alphaos) code\b', 'pillar': 'code'},
+    {'name': 'body', 'domain': 'body', 'pillar': 'core', 'keywords': [
+        'workout*', 'training', 'gym', 'fitness', 'cardio', 'jogging', 'yoga', 'stretching',
+        'mobility', 'sleep', 'meal prep', 'protein', 'doctor', 'dentist', 'physio*',
+    ]},
+    {'name': 'being', 'domain': 'being', 'pillar': 'core', 'keywords': [
+        'meditat*', 'journaling', 'prayer', 'pray', 'breathwork', 'gratitude', 'reflection',
+        'retreat',
+    ]},
+    {'name': 'balance', 'domain': 'balance', 'pillar': 'core', 'keywords': [
+        'family', 'partner', 'wife', 'husband', 'kids', 'friend', 'friends', 'birthday',
+        'date night', 'mom', 'dad', 'parents',
+    ]},
+    {'name': 'business', 'domain': 'business', 'pillar': 'core', 'keywords': [
+        'invoice*', 'client', 'clients', 'customer*', 'meeting*', 'sales', 'tax', 'taxes',
+        'tax return', 'proposal*', 'offer', 'revenue', 'contract*', 'launch', 'marketing',
+    ]},
+]
+
+# Seconds a cached project list may stand in while the API is unreachable
+# (it is revalidated on every run); overridable as ticktick.project_cache_ttl
+TICKTICK_PROJECT_TTL = 24 * 3600
 
 
 def load_config():
@@ -56,21 +119,316 @@ def load_ticktick_config():
         return json.load(f)
 
 
-def get_ticktick_client(tt_config):
-    """Get authenticated TickTick client"""
-    if not TICKTICK_AVAILABLE:
-        raise RuntimeError("ticktick-py not installed")
+class TickTickError(RuntimeError):
+    """Failed TickTick API request"""
+
+    def __init__(self, status, path):
+        super().__init__(f"TickTick API returned {status} for {path}")
+        self.status = status
+
+
+class TickTickClient:
+    """Async TickTick Open API client
+
+    All requests share one aiohttp session, so connections are pooled and
+    kept alive; the pool size bounds how many requests run at once. Use
+    as an async context manager.
+    """
+
+    def __init__(self, token, base_url=TICKTICK_API_BASE, concurrency=TICKTICK_CONCURRENCY):
+        self.token = token
+        self.base_url = base_url.rstrip('/')
+        self.concurrency = concurrency
+        self.session = None
+
+    async def __aenter__(self):
+        import aiohttp
+
+        self.session = aiohttp.ClientSession(
+            headers={'Authorization': f'Bearer {self.token}'},
+            connector=aiohttp.TCPConnector(limit=self.concurrency),
+            timeout=aiohttp.ClientTimeout(total=TICKTICK_TIMEOUT),
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.session.close()
+
+    async def get(self, path):
+        """GET a JSON resource"""
+        return await self.request('GET', path)
+
+    async def request(self, method, path, payload=None):
+        """Send a request and return the JSON response"""
+        _, data, _ = await self.send(method, path, payload)
+        return data
+
+    async def send(self, method, path, payload=None, headers=None):
+        """Send a request, retrying rate limits and server errors
+
+        Returns (status, JSON body, response headers) for 200, and
+        (304, None, headers) when a conditional request found no change.
+        """
+        import asyncio
+
+        for attempt in range(TICKTICK_MAX_RETRIES + 1):
+            async with self.session.request(
+                method, self.base_url + path, json=payload, headers=headers
+            ) as resp:
+                if resp.status == 200:
+                    return 200, await resp.json(content_type=None), resp.headers
+                if resp.status == 304:
+                    return 304, None, resp.headers
+                retryable = resp.status == 429 or resp.status >= 500
+                if not retryable or attempt == TICKTICK_MAX_RETRIES:
+                    raise TickTickError(resp.status, path)
+            await asyncio.sleep(random.uniform(0, TICKTICK_BACKOFF_BASE * 2 ** attempt))
+
+    async def projects(self):
+        """All projects (lists), without the inbox"""
+        return await self.get('/project')
+
+    async def project_tasks(self, project_id):
+        """Open tasks of one project"""
+        data = await self.get(f'/project/{project_id}/data')
+        return data.get('tasks', [])
+
+    async def update_task(self, task):
+        """Update a task; the body needs at least id and projectId"""
+        return await self.request('POST', f"/task/{task['id']}", task)
+
+    async def iter_tasks(self, project_ids=None):
+        """Yield the open tasks of all projects, fetched concurrently
+
+        Each project's tasks are yielded as soon as its page arrives, so
+        mapping starts before the slowest project has answered.
+        """
+        import asyncio
+
+        if project_ids is None:
+            project_ids = [TICKTICK_INBOX_ID] + [p['id'] for p in await self.projects()]
+
+        for page in asyncio.as_completed([self.project_tasks(pid) for pid in project_ids]):
+            for task in await page:
+                yield task
+
+
+def get_ticktick_client(tt_config, config=None):
+    """Get a TickTick client for the configured token and API base URL"""
+    try:
+        import aiohttp  # noqa: F401
+    except ImportError:
+        print("To enable: pip install --user aiohttp", file=sys.stderr)
+        raise RuntimeError("aiohttp not installed")
+
+    token = tt_config.get('access_token') or tt_config.get('token')
+    if not token:
+        print(f"ERROR: No access_token in {TICKTICK_CONFIG}", file=sys.stderr)
+        print("Create an app at https://developer.ticktick.com and run its OAuth flow", file=sys.stderr)
+        raise RuntimeError("TickTick access token missing")
+
+    tt_settings = (config or {}).get('ticktick', {})
+    base_url = (
+        os.environ.get('TICKTICK_API_BASE')
+        or tt_settings.get('api_base')
+        or TICKTICK_API_BASE
+    )
+    return TickTickClient(token, base_url, tt_settings.get('concurrency', TICKTICK_CONCURRENCY))
+
+
+def read_project_cache():
+    """Cached project list: {fetched, etag, last_modified, projects}"""
+    try:
+        with open(TICKTICK_PROJECT_CACHE, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_project_cache(cache):
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_file = TICKTICK_PROJECT_CACHE.with_suffix('.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump(cache, f)
+        os.replace(tmp_file, TICKTICK_PROJECT_CACHE)
+    except OSError:
+        pass
+
+
+async def load_project_names(client, ttl=TICKTICK_PROJECT_TTL):
+    """projectId → name for all projects, one list fetch per run
+
+    The cached list is always revalidated with If-None-Match /
+    If-Modified-Since, so an unchanged list costs a 304 and no body and a
+    new list is never missed. When the API is unreachable, a cached list
+    validated within the last `ttl` seconds is used instead.
+    """
+    import asyncio
+    import aiohttp
+
+    cache = read_project_cache()
+    headers = {}
+    if cache.get('etag'):
+        headers['If-None-Match'] = cache['etag']
+    if cache.get('last_modified'):
+        headers['If-Modified-Since'] = cache['last_modified']
+
+    try:
+        status, projects, response_headers = await client.send('GET', '/project', headers=headers)
+    except (aiohttp.ClientError, asyncio.TimeoutError, TickTickError) as e:
+        if 'projects' not in cache or time.time() - cache.get('fetched', 0) > ttl:
+            raise
+        print(f"WARNING: Using cached TickTick project list: {e}", file=sys.stderr)
+        return cache['projects']
+
+    if status == 200:
+        cache = {
+            'projects': {project['id']: project['name'] for project in projects},
+            'etag': response_headers.get('ETag'),
+            'last_modified': response_headers.get('Last-Modified'),
+        }
+    cache['fetched'] = time.time()
+    write_project_cache(cache)
+    return cache['projects']
+
+
+def project_name(project_id, project_names):
+    """Taskwarrior project for a TickTick list, e.g. TickTick.Side_Projects"""
+    name = project_names.get(project_id)
+    if not name:
+        name = 'Inbox' if project_id.startswith('inbox') else project_id
+    # Dots would nest projects in Taskwarrior
+    return 'TickTick.' + re.sub(r'[\s.]+', '_', name.strip())
+
+
+def keyword_pattern(keyword):
+    """Regex for one classifier keyword: a whole word, or a stem with a trailing *"""
+    if keyword.endswith('*'):
+        return re.escape(keyword[:-1])
+    return re.escape(keyword) + r'\b'
+
+
+def embeddable(pattern):
+    """Whether a pattern still compiles inside a larger regex"""
+    try:
+        re.compile(f'x(?:{pattern})')
+    except re.error:
+        return False
+    return True
+
+
+class Classifier:
+    """Domain/pillar keyword rules compiled into a single regex
 
-    # TickTick config contains token
-    # This is a simplified version - actual implementation depends on ticktick-py API
-    # TODO: Implement proper TickTick OAuth flow
-    print("NOTE: TickTick API integration requires manual token extraction", file=sys.stderr)
-    print("For now, this is a placeholder. Full implementation coming soon.", file=sys.stderr)
-    return None
+    Each rule becomes a named, optional lookahead of one pattern, behind a
+    lookahead for any rule. A finditer over a text stops only at positions
+    where some rule matches and there captures every rule matching at that
+    position, so rules overlapping one another (gym vs. gym day) are all
+    seen. Hit counts per rule (matched) and per rule and field (decided)
+    are kept for tuning.
 
+    Patterns with groups of their own (named groups, backreferences) would
+    clash with the rule groups, and inline global flags are only valid at
+    the start of a regex, so such rules get a regex of their own.
+    """
 
-def map_ticktick_to_taskwarrior(tt_task, config):
-    """Convert TickTick task to Taskwarrior task"""
+    def __init__(self, rules):
+        self.rules = []
+        alternatives = []
+        self.separate = []
+        for index, rule in enumerate(rules):
+            name = rule.get('name', f'rule {index + 1}')
+            if rule.get('domain') not in (None,) + ALPHAOS_DOMAINS:
+                raise ValueError(f"Classifier rule '{name}': unknown domain {rule['domain']!r}")
+            if rule.get('pillar') not in (None,) + ALPHAOS_PILLARS:
+                raise ValueError(f"Classifier rule '{name}': unknown pillar {rule['pillar']!r}")
+
+            if 'pattern' in rule:
+                pattern = rule['pattern']
+            elif rule.get('keywords'):
+                pattern = r'\b(?:' + '|'.join(keyword_pattern(k) for k in rule['keywords']) + ')'
+            else:
+                raise ValueError(f"Classifier rule '{name}' needs keywords or a pattern")
+            try:
+                compiled = re.compile(pattern, re.IGNORECASE)
+            except re.error as e:
+                raise ValueError(f"Classifier rule '{name}': {e}")
+
+            self.rules.append({
+                'name': name,
+                'fields': {f: rule[f] for f in ('domain', 'pillar') if rule.get(f)},
+            })
+            if compiled.groups or not embeddable(pattern):
+                self.separate.append((index, compiled))
+            else:
+                alternatives.append((index, pattern))
+
+        self.regex = None
+        if alternatives:
+            any_rule = '(?=' + '|'.join(f'(?:{pattern})' for _, pattern in alternatives) + ')'
+            each_rule = ''.join(f'(?:(?=(?P<r{index}>{pattern}))|)' for index, pattern in alternatives)
+            try:
+                self.regex = re.compile(any_rule + each_rule, re.IGNORECASE)
+            except re.error as e:
+                raise ValueError(f"Classifier rules cannot be combined: {e}")
+        self.hits = {rule['name']: 0 for rule in self.rules}
+        self.decided = {}
+
+    def classify_batch(self, texts):
+        """Domain/pillar dicts for a list of texts, compiled pattern shared"""
+        return [self.classify(text) for text in texts]
+
+    def classify(self, text):
+        """Domain/pillar dict for one text"""
+        matched = {index for index, regex in self.separate if regex.search(text)}
+        for match in self.regex.finditer(text) if self.regex else ():
+            matched.update(
+                int(group[1:]) for group, value in match.groupdict().items() if value is not None
+            )
+        return self.decide(matched)
+
+    def decide(self, rule_indexes):
+        result = {}
+        for index in sorted(rule_indexes):
+            rule = self.rules[index]
+            self.hits[rule['name']] += 1
+            for field, value in rule['fields'].items():
+                if field not in result:
+                    result[field] = value
+                    key = (rule['name'], field)
+                    self.decided[key] = self.decided.get(key, 0) + 1
+        return result
+
+    def report(self):
+        """Per-rule hit counts, one line per rule"""
+        lines = []
+        for rule in self.rules:
+            name = rule['name']
+            decided = ', '.join(
+                f"{field} {self.decided.get((name, field), 0)}" for field in rule['fields']
+            )
+            lines.append(f"  {name}: matched {self.hits[name]} (decided {decided})")
+        return lines
+
+
+def classify_text(tt_task):
+    """Text the classifier looks at: title and content"""
+    return f"{tt_task.get('title', '')} {tt_task.get('content') or ''}"
+
+
+def get_classifier(config):
+    """Classifier for the configured (or built-in) rules"""
+    rules = config.get('ticktick', {}).get('classifier_rules', DEFAULT_CLASSIFIER_RULES)
+    return Classifier(rules)
+
+
+def map_ticktick_to_taskwarrior(tt_task, config, project_names=None, classification=None):
+    """Convert TickTick task to Taskwarrior task
+
+    classification is the task's Classifier.classify() result; without it the
+    task is classified on its own.
+    """
 
     # Base task
     tw_task_data = {
@@ -97,29 +455,210 @@ def map_ticktick_to_taskwarrior(tt_task, config):
     elif tt_priority >= 1:
         tw_task_data['priority'] = 'L'
 
-    # Project from TickTick list
+    # Project from TickTick list name
     if tt_task.get('projectId'):
-        # Map TickTick list to Taskwarrior project
-        # This would require fetching list name from API
-        tw_task_data['project'] = f"TickTick.{tt_task['projectId']}"
+        tw_task_data['project'] = project_name(tt_task['projectId'], project_names or {})
 
     # Tags from TickTick
     if tt_task.get('tags'):
         for tag in tt_task['tags']:
-            tw_task_data['tags'].append(tag.replace(' ', '_'))
-
-    # AlphaOS inference (optional)
-    # Try to infer pillar/domain from task content
-    title_lower = tt_task.get('title', '').lower()
+            tag = tag.replace(' ', '_')
+            if tag not in tw_task_data['tags']:
+                tw_task_data['tags'].append(tag)
 
-    if any(word in title_lower for word in ['workout', 'training', 'gym', 'fitness']):
-        tw_task_data['domain'] = 'body'
-        tw_task_data['pillar'] = 'CORE'
+    # AlphaOS inference: domain/pillar from task content
+    if classification is None:
+        classification = get_classifier(config).classify(classify_text(tt_task))
+    tw_task_data.update(classification)
 
     return tw_task_data
 
 
-def import_from_ticktick(dry_run=False):
+def format_tw_date(value):
+    """Format an aware datetime as a Taskwarrior date"""
+    return value.astimezone(timezone.utc).strftime(TW_DATE_FORMAT)
+
+
+def serialize_fields(tw_task_data):
+    """Mapped task data with dates in Taskwarrior's export format"""
+    return {
+        key: format_tw_date(value) if isinstance(value, datetime) else value
+        for key, value in tw_task_data.items()
+    }
+
+
+def fields_hash(fields):
+    """Stable content hash of serialized mapped fields"""
+    payload = json.dumps(fields, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def load_import_state():
+    """Load the TickTick id → {uuid, hash, fields} index"""
+    if not TICKTICK_STATE_FILE.exists():
+        return {'tasks': {}}
+
+    try:
+        with open(TICKTICK_STATE_FILE, 'r') as f:
+            state = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"WARNING: Ignoring unreadable import state {TICKTICK_STATE_FILE}: {e}", file=sys.stderr)
+        return {'tasks': {}}
+
+    state.setdefault('tasks', {})
+    return state
+
+
+def save_import_state(state):
+    """Atomically write the import index"""
+    CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_file = TICKTICK_STATE_FILE.with_suffix('.tmp')
+    with open(tmp_file, 'w') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp_file, TICKTICK_STATE_FILE)
+
+
+def new_record(fields, now):
+    """Complete mapped fields into a `task import` record for a new task
+
+    The uuid is assigned here, so callers know it before the import runs.
+    """
+    record = {
+        'uuid': str(uuid.uuid4()),
+        'status': 'pending',
+        'entry': format_tw_date(now),
+    }
+    record.update(fields)
+    return record
+
+
+def updated_record(current, previous, fields):
+    """Apply changed mapped fields to the task as Taskwarrior has it
+
+    Fields the previous import set but the new mapping lacks are removed;
+    tags added in Taskwarrior by hand are kept.
+    """
+    record = {key: value for key, value in current.items() if key not in ('id', 'urgency')}
+    for key in previous:
+        if key not in fields:
+            record.pop(key, None)
+    record.update(fields)
+
+    old_tags = set(previous.get('tags', []))
+    own_tags = [tag for tag in current.get('tags', []) if tag not in old_tags]
+    tags = fields.get('tags', []) + [tag for tag in own_tags if tag not in fields.get('tags', [])]
+    if tags:
+        record['tags'] = tags
+    else:
+        record.pop('tags', None)
+    return record
+
+
+def export_tasks(uuids):
+    """Current Taskwarrior data of the given tasks, from one `task export`"""
+    cmd = [
+        'task',
+        f'rc.data.location={TASK_DATA_DIR}',
+        'rc.verbose=nothing',
+        *uuids,
+        'export',
+    ]
+    result = subprocess.run(cmd, text=True, capture_output=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"task export failed: {result.stderr.strip()}")
+    return {task['uuid']: task for task in json.loads(result.stdout or '[]')}
+
+
+def import_tasks(records):
+    """Add or update all records with a single `task import` run"""
+    cmd = [
+        'task',
+        f'rc.data.location={TASK_DATA_DIR}',
+        'rc.verbose=nothing',
+        'rc.confirmation=off',
+        'import',
+    ]
+    lines = ''.join(json.dumps(record) + '\n' for record in records)
+    result = subprocess.run(cmd, input=lines, text=True, capture_output=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"task import failed: {result.stderr.strip()}")
+
+
+def plan_import(items, state):
+    """Split mapped TickTick tasks into new, changed and unchanged
+
+    Returns (new, changed, skipped); new and changed are lists of
+    (tt_task, fields, digest) tuples.
+    """
+    new, changed = [], []
+    skipped = 0
+    for tt_task, fields in items:
+        digest = fields_hash(fields)
+        entry = state['tasks'].get(tt_task['id'])
+        if entry is None:
+            new.append((tt_task, fields, digest))
+        elif entry['hash'] != digest:
+            changed.append((tt_task, fields, digest))
+        else:
+            skipped += 1
+    return new, changed, skipped
+
+
+async def collect_tagged_tasks(client, config, classifier):
+    """Fetch tagged TickTick tasks and run them through the mapper
+
+    Returns (tt_task, serialized fields) pairs. The whole batch is
+    classified with the same compiled classifier before mapping.
+    """
+    tt_settings = config.get('ticktick', {})
+    import_tag = tt_settings.get('import_tag', 'claudewarrior').lstrip('+')
+
+    tagged = []
+    async with client:
+        # The (revalidated) project list doubles as the set of projects to fetch
+        project_names = await load_project_names(
+            client, tt_settings.get('project_cache_ttl', TICKTICK_PROJECT_TTL)
+        )
+        project_ids = [TICKTICK_INBOX_ID] + list(project_names)
+
+        async for tt_task in client.iter_tasks(project_ids):
+            if import_tag in tt_task.get('tags', []):
+                tagged.append(tt_task)
+
+    classifications = classifier.classify_batch([classify_text(tt_task) for tt_task in tagged])
+    items = []
+    for tt_task, classification in zip(tagged, classifications):
+        try:
+            tw_task_data = map_ticktick_to_taskwarrior(
+                tt_task, config, project_names, classification
+            )
+        except Exception as e:
+            print(f"ERROR mapping task {tt_task.get('id')}: {e}", file=sys.stderr)
+            continue
+        items.append((tt_task, serialize_fields(tw_task_data)))
+
+    return items
+
+
+async def remove_import_tag(client, tt_tasks, import_tag):
+    """Drop the import tag from imported TickTick tasks, concurrently"""
+    import asyncio
+
+    async def untag(tt_task):
+        body = dict(tt_task, tags=[tag for tag in tt_task['tags'] if tag != import_tag])
+        try:
+            await client.update_task(body)
+            return True
+        except Exception as e:
+            print(f"ERROR removing tag from TickTick task {tt_task['id']}: {e}", file=sys.stderr)
+            return False
+
+    async with client:
+        results = await asyncio.gather(*(untag(tt_task) for tt_task in tt_tasks))
+    return sum(results)
+
+
+def import_from_ticktick(dry_run=False, classifier_stats=False):
     """Main import function"""
 
     print("[ClaudeWarrior] Starting TickTick → Taskwarrior import...")
@@ -138,63 +677,98 @@ def import_from_ticktick(dry_run=False):
     except SystemExit:
         return 1
 
-    # Initialize Taskwarrior
-    tw = TaskWarrior(data_location=str(Path.home() / '.task'))
-
-    # PLACEHOLDER: Full TickTick API implementation coming soon
-    print("\n" + "="*60)
-    print("TickTick API Integration - PLACEHOLDER")
-    print("="*60)
-    print("\nThis feature requires:")
-    print("1. Install ticktick-py: pip install --user ticktick-py")
-    print("2. TickTick API access (OAuth or app password)")
-    print("3. Manual tag in TickTick: Add 'claudewarrior' tag to tasks")
-    print("\nFor now, you can manually create tasks in Taskwarrior")
-    print("and we'll implement full TickTick sync in a future update.")
-    print("="*60)
-
-    # Example of what the full implementation would look like:
-    """
-    client = get_ticktick_client(tt_config)
-    if not client:
+    try:
+        client = get_ticktick_client(tt_config, config)
+    except RuntimeError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
         return 1
 
-    # Get tasks tagged with 'claudewarrior'
-    import_tag = config.get('ticktick', {}).get('import_tag', 'claudewarrior')
-    tasks = client.get_tasks_by_tag(import_tag)
+    try:
+        classifier = get_classifier(config)
+    except (TypeError, ValueError) as e:
+        print(f"ERROR: Invalid classifier_rules in {CONFIG_FILE}: {e}", file=sys.stderr)
+        return 1
 
-    imported_count = 0
-    for tt_task in tasks:
-        try:
-            tw_task_data = map_ticktick_to_taskwarrior(tt_task, config)
+    import asyncio
+    import aiohttp
 
-            if dry_run:
-                print(f"  Would import: {tw_task_data['description']}")
-            else:
-                tw_task = Task(tw, **tw_task_data)
-                tw_task.save()
-                print(f"  ✓ Imported: {tw_task_data['description']}")
-                imported_count += 1
+    try:
+        items = asyncio.run(collect_tagged_tasks(client, config, classifier))
+    except (aiohttp.ClientError, asyncio.TimeoutError, TickTickError) as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
 
-            # Optionally remove tag from TickTick
-            if config.get('ticktick', {}).get('remove_tag_after_import', False):
-                # Remove 'claudewarrior' tag from TickTick task
-                pass
+    if classifier_stats:
+        print("Classifier hits:")
+        print('\n'.join(classifier.report()))
 
-        except Exception as e:
-            print(f"ERROR importing task: {e}", file=sys.stderr)
+    # Unchanged tasks are skipped by hash, without touching Taskwarrior
+    state = load_import_state()
+    new, changed, skipped = plan_import(items, state)
+    print(f"Found {len(items)} tagged tasks: {len(new)} new, {len(changed)} changed, {skipped} unchanged")
 
-    print(f"\n[ClaudeWarrior] Imported {imported_count} tasks from TickTick")
-    """
+    if dry_run:
+        for _, fields, _ in new:
+            print(f"  Would import: {fields['description']}")
+        for _, fields, _ in changed:
+            print(f"  Would update: {fields['description']}")
+        return 0
+
+    now = datetime.now(timezone.utc)
+    records = []
+    for tt_task, fields, digest in new:
+        record = new_record(fields, now)
+        records.append(record)
+        state['tasks'][tt_task['id']] = {'uuid': record['uuid'], 'hash': digest, 'fields': fields}
+
+    # One export for all changed tasks, then one import for everything
+    try:
+        if changed:
+            entries = [state['tasks'][tt_task['id']] for tt_task, _, _ in changed]
+            current = export_tasks([entry['uuid'] for entry in entries])
+            for (tt_task, fields, digest), entry in zip(changed, entries):
+                task = current.get(entry['uuid'])
+                if task is None:
+                    # Purged from Taskwarrior: bring it back under its uuid
+                    record = dict(new_record(fields, now), uuid=entry['uuid'])
+                else:
+                    record = updated_record(task, entry['fields'], fields)
+                records.append(record)
+                entry.update(hash=digest, fields=fields)
+
+        if records:
+            import_tasks(records)
+    except (OSError, RuntimeError) as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+    save_import_state(state)
+
+    for _, fields, _ in new:
+        print(f"  ✓ Imported: {fields['description']}")
+    for _, fields, _ in changed:
+        print(f"  ✓ Updated: {fields['description']}")
+
+    # Optionally remove the import tag in TickTick; unchanged tasks still
+    # carrying it are retried, the index keeps them from being duplicated
+    if config.get('ticktick', {}).get('remove_tag_after_import', False) and items:
+        import_tag = config['ticktick'].get('import_tag', 'claudewarrior').lstrip('+')
+        try:
+            untagged = asyncio.run(remove_import_tag(client, [tt for tt, _ in items], import_tag))
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"ERROR: {e}", file=sys.stderr)
+            return 1
+        print(f"Removed the '{import_tag}' tag from {untagged} TickTick tasks")
 
+    print(f"\n[ClaudeWarrior] Imported {len(new)} and updated {len(changed)} tasks from TickTick")
     return 0
 
 
 if __name__ == '__main__':
     dry_run = '--dry-run' in sys.argv
+    classifier_stats = '--classifier-stats' in sys.argv
 
     try:
-        sys.exit(import_from_ticktick(dry_run=dry_run))
+        sys.exit(import_from_ticktick(dry_run=dry_run, classifier_stats=classifier_stats))
     except KeyboardInterrupt:
         print("\nImport cancelled by user")
         sys.exit(130)
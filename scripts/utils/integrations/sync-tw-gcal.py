@@ -3,43 +3,176 @@
 ClaudeWarrior: Taskwarrior → Google Calendar Sync
 Syncs tasks with +fire tag or due dates to Google Calendar
 
+Usage:
+    sync-tw-gcal.py [--dry-run] [--batch] [--since-last] [--pull] [--metrics] [--metrics-history]
+    sync-tw-gcal.py --explain [--since-last]
+    sync-tw-gcal.py --watch [--batch] [--metrics] [--metrics-history]
+
+--metrics prints a JSON report with wall time per phase, API calls by
+method and calendar, retries, bytes sent and task counts; progress output
+then goes to stderr, so stdout carries only the report (`--metrics | jq`).
+--metrics-history appends the same report as one line to the metrics
+history file.
+
+--explain shows which routing rule picked the calendar and the colour of
+each candidate task, without syncing. Rules live in google_calendar.routing_rules
+in config.json, e.g.
+    {"name": "urgent-work", "match": {"project": "work", "urgency_min": 10},
+     "calendar": "work@group.calendar.google.com", "color": "11"}
+and replace the built-in fire → domain → default rules.
+
+--pull first brings calendar-side edits back into Taskwarrior: events
+that were dragged to another time or renamed in Google Calendar update the
+due date and description of their task (in one `task import`), instead
+of being overwritten by the next push. Set "pull_changes": true in the
+google_calendar config to always do this. --dry-run and --explain never
+contact Google, so they skip the pull.
+
+--watch keeps running and pushes only the tasks that changed. Changes are
+picked up from the Taskwarrior data directory and, faster, from hook
+events: symlink this script as ~/.task/hooks/on-add.claudewarrior-gcal and
+~/.task/hooks/on-modify.claudewarrior-gcal.
+
+Mutations that fail on network or API errors are journaled to
+gcal_journal.jsonl in the config directory and replayed, in order, by the
+next run (or by --watch once the API is reachable again).
+
+Events created by older versions (description "Task ID: <number>", no
+uuid property) are adopted on the first full listing of their calendar
+when summary and start match a task, so upgrading does not duplicate them.
+
 Requirements:
-    pip install --user google-api-python-client google-auth-oauthlib tasklib
+    pip install --user google-api-python-client google-auth-oauthlib
+    task (Taskwarrior CLI) on PATH
 """
 
+import bisect
+import hashlib
 import json
+import calendar
 import os
+import queue
+import random
+import re
+import socket
+import subprocess
 import sys
-from datetime import datetime, timedelta
+import threading
+import time
+from contextlib import contextmanager, nullcontext, redirect_stdout
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from zoneinfo import ZoneInfo
 
-# Try importing dependencies
-try:
-    from tasklib import TaskWarrior
-except ImportError:
-    print("ERROR: tasklib not installed. Run: pip install --user tasklib", file=sys.stderr)
-    sys.exit(1)
-
-try:
-    from google.oauth2.credentials import Credentials
-    from google_auth_oauthlib.flow import InstalledAppFlow
-    from google.auth.transport.requests import Request
-    from googleapiclient.discovery import build
-    GOOGLE_API_AVAILABLE = True
-except ImportError:
-    GOOGLE_API_AVAILABLE = False
-    print("WARNING: Google API libraries not installed. GCal sync disabled.", file=sys.stderr)
-    print("To enable: pip install --user google-api-python-client google-auth-oauthlib", file=sys.stderr)
+# The Google API stack is imported lazily in get_gcal_service(), so
+# --dry-run, unchanged runs and the Taskwarrior hook never pay for it.
 
 # Config
 CONFIG_DIR = Path.home() / ".config" / "claudewarrior"
 CONFIG_FILE = CONFIG_DIR / "config.json"
 GCAL_TOKEN_FILE = CONFIG_DIR / "gcal_token.json"
 GCAL_CREDS_FILE = CONFIG_DIR / "gcal_credentials.json"
+GCAL_STATE_FILE = CONFIG_DIR / "gcal_state.json"
+GCAL_JOURNAL_FILE = CONFIG_DIR / "gcal_journal.jsonl"
+GCAL_METRICS_FILE = CONFIG_DIR / "logs" / "gcal-sync-metrics.jsonl"
+CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME', Path.home() / ".cache")) / "claudewarrior"
+GCAL_DISCOVERY_CACHE = CACHE_DIR / "calendar-v3-discovery.json"
+GCAL_DISCOVERY_MAX_AGE = 30 * 24 * 3600
+GCAL_WATCH_SOCKET = CONFIG_DIR / "gcal-sync.sock"
+TASK_DATA_DIR = Path.home() / ".task"
+
+# Watch mode: data dir poll interval, quiet period before a sync and the
+# longest a burst of changes may delay it (seconds)
+WATCH_POLL_INTERVAL = 1.0
+WATCH_DEBOUNCE = 2.0
+WATCH_MAX_DELAY = 30.0
+# Seconds between replays of journaled mutations while the API is unreachable
+WATCH_RETRY_INTERVAL = 60.0
+
+# Taskwarrior export date format (UTC) and the fields using it
+TW_DATE_FORMAT = '%Y%m%dT%H%M%SZ'
+TW_DATE_FIELDS = ('due', 'end', 'entry', 'modified', 'scheduled', 'start', 'until', 'wait')
+
+# Event time zone; recurrence rules are expanded in it
+GCAL_TIMEZONE = 'Europe/Berlin'  # TODO: Make configurable
+
+# Taskwarrior recur values → (RRULE FREQ, INTERVAL); WEEKDAYS is daily
+# without Saturday/Sunday. Numeric forms like 2d, 3wks, P1M are parsed too.
+RECUR_NAMES = {
+    'hourly': ('HOURLY', 1),
+    'daily': ('DAILY', 1),
+    'day': ('DAILY', 1),
+    'weekdays': ('WEEKDAYS', 1),
+    'weekly': ('WEEKLY', 1),
+    'sennight': ('WEEKLY', 1),
+    'biweekly': ('WEEKLY', 2),
+    'fortnight': ('WEEKLY', 2),
+    'monthly': ('MONTHLY', 1),
+    'bimonthly': ('MONTHLY', 2),
+    'quarterly': ('MONTHLY', 3),
+    'semiannual': ('MONTHLY', 6),
+    'yearly': ('YEARLY', 1),
+    'annual': ('YEARLY', 1),
+    'biannual': ('YEARLY', 2),
+    'biyearly': ('YEARLY', 2),
+}
+RECUR_UNITS = {
+    'HOURLY': ('h', 'hr', 'hrs', 'hour', 'hours'),
+    'DAILY': ('d', 'day', 'days'),
+    'WEEKLY': ('w', 'wk', 'wks', 'week', 'weeks'),
+    'MONTHLY': ('mo', 'mos', 'mth', 'mths', 'month', 'months'),
+    'QUARTERLY': ('q', 'qtr', 'qtrs', 'quarter', 'quarters'),
+    'YEARLY': ('y', 'yr', 'yrs', 'year', 'years'),
+}
+RECUR_ISO_UNITS = {'H': 'HOURLY', 'D': 'DAILY', 'W': 'WEEKLY', 'M': 'MONTHLY', 'Y': 'YEARLY'}
+
+# Child fields that make an occurrence diverge from its recurring parent
+RECUR_COMPARE_FIELDS = ('description', 'project', 'domain', 'pillar', 'alphatype')
 
 # Google Calendar API scopes
 SCOPES = ['https://www.googleapis.com/auth/calendar']
 
+# Calendar API accepts at most 50 calls per batch request
+GCAL_BATCH_SIZE = 50
+
+# Calendar API quota defaults, overridable in config.json google_calendar:
+# rate_limit_qps, rate_limit_burst, workers, max_retries
+GCAL_DEFAULT_QPS = 8
+GCAL_DEFAULT_BURST = 10
+GCAL_DEFAULT_WORKERS = 4
+GCAL_MAX_RETRIES = 5
+GCAL_BACKOFF_BASE = 1.0
+GCAL_BACKOFF_CAP = 32.0
+GCAL_RETRY_REASONS = {'rateLimitExceeded', 'userRateLimitExceeded'}
+
+# Private extended property tagging events with their task uuid
+GCAL_UUID_PROPERTY = 'claudewarriorUuid'
+# Events written before the uuid property existed carry the task's
+# working-set number in the first line of their description
+LEGACY_DESCRIPTION = re.compile(r'Task ID: \d+[ \t]*(?:\n|$)')
+
+# Event fields owned by the sync; only these are compared and patched
+EVENT_SYNC_FIELDS = ('summary', 'description', 'start', 'end', 'colorId', 'recurrence')
+
+# Guards state entries shared between calendar workers (moves)
+STATE_LOCK = threading.Lock()
+
+# Calendar and colour routing, overridable with google_calendar.routing_rules.
+# Rules are tried in order; the calendar comes from the first matching rule
+# that sets one (calendar_key names a config entry, calendar is a literal id
+# or the fallback), the colour likewise. fallthrough skips a rule whose
+# calendar is not configured.
+ROUTING_MATCH_FIELDS = ('domain', 'pillar', 'alphatype', 'project')
+ROUTING_MATCH_KEYS = ('tags', 'urgency_min', 'urgency_max') + ROUTING_MATCH_FIELDS
+DEFAULT_ROUTING_RULES = [
+    {'name': 'fire', 'match': {'tags': ['fire']}, 'calendar_key': 'fire_map_cal_id'},
+    {'name': 'body', 'match': {'domain': 'body'}, 'calendar_key': 'trainingsplan_cal_id', 'color': '4'},
+    {'name': 'being', 'match': {'domain': 'being'}, 'calendar_key': 'being_cal_id', 'fallthrough': True, 'color': '9'},
+    {'name': 'balance', 'match': {'domain': 'balance'}, 'calendar_key': 'balance_cal_id', 'fallthrough': True, 'color': '5'},
+    {'name': 'business', 'match': {'domain': 'business'}, 'calendar_key': 'business_cal_id', 'fallthrough': True, 'color': '2'},
+    {'name': 'default', 'calendar_key': 'default_cal_id', 'calendar': 'primary', 'color': '7'},
+]
+
 
 def load_config():
     """Load ClaudeWarrior config"""
@@ -52,9 +185,42 @@ def load_config():
         return json.load(f)
 
 
+# Authenticated service, kept for the lifetime of the process
+_gcal_service = None
+
+
+def build_calendar_service(creds):
+    """Build the Calendar v3 service from a locally cached discovery document"""
+    from googleapiclient.discovery import build, build_from_document
+
+    try:
+        age = time.time() - GCAL_DISCOVERY_CACHE.stat().st_mtime
+        if age < GCAL_DISCOVERY_MAX_AGE:
+            return build_from_document(GCAL_DISCOVERY_CACHE.read_text(), credentials=creds)
+    except (OSError, ValueError):
+        pass
+
+    service = build('calendar', 'v3', credentials=creds, cache_discovery=False)
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        GCAL_DISCOVERY_CACHE.write_text(json.dumps(service._rootDesc))
+    except (OSError, AttributeError):
+        pass
+    return service
+
+
 def get_gcal_service():
     """Get authenticated Google Calendar service"""
-    if not GOOGLE_API_AVAILABLE:
+    global _gcal_service
+    if _gcal_service is not None:
+        return _gcal_service
+
+    try:
+        from google.oauth2.credentials import Credentials
+        from google_auth_oauthlib.flow import InstalledAppFlow
+        from google.auth.transport.requests import Request
+    except ImportError:
+        print("To enable: pip install --user google-api-python-client google-auth-oauthlib", file=sys.stderr)
         raise RuntimeError("Google Calendar API libraries not installed")
 
     creds = None
@@ -82,37 +248,372 @@ def get_gcal_service():
         with open(GCAL_TOKEN_FILE, 'w') as token:
             token.write(creds.to_json())
 
-    return build('calendar', 'v3', credentials=creds)
+    _gcal_service = build_calendar_service(creds)
+    return _gcal_service
 
 
-def map_task_to_calendar(task, config):
-    """Determine which calendar a task should go to"""
-    gcal_config = config.get('google_calendar', {})
+def parse_tw_date(value):
+    """Parse a Taskwarrior export date into a local aware datetime"""
+    return datetime.strptime(value, TW_DATE_FORMAT).replace(tzinfo=timezone.utc).astimezone()
+
+
+def format_tw_date(value):
+    """Format an aware datetime as a Taskwarrior date"""
+    return value.astimezone(timezone.utc).strftime(TW_DATE_FORMAT)
+
+
+def export_tasks(filters):
+    """Stream tasks from a single `task export` run
+
+    With rc.json.array=off Taskwarrior writes one JSON object per line, so
+    tasks are parsed and yielded one at a time instead of loading the whole
+    export into memory.
+    """
+    cmd = [
+        'task',
+        f'rc.data.location={TASK_DATA_DIR}',
+        'rc.json.array=off',
+        'rc.verbose=nothing',
+        'rc.confirmation=off',
+        *filters,
+        'export',
+    ]
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True) as proc:
+        for line in proc.stdout:
+            line = line.strip().rstrip(',')
+            if not line:
+                continue
+            task = json.loads(line)
+            for field in TW_DATE_FIELDS:
+                if field in task:
+                    task[field] = parse_tw_date(task[field])
+            yield task
+
+    if proc.returncode != 0:
+        raise RuntimeError(f"task export failed with exit code {proc.returncode}")
+
+
+def import_tasks(tasks):
+    """Write modified tasks back with a single `task import` run
+
+    Hooks are disabled for the import; the tasks come from the calendar,
+    so there is nothing to sync back there.
+    """
+    lines = []
+    for task in tasks:
+        record = {key: value for key, value in task.items() if key not in ('id', 'urgency')}
+        for field in TW_DATE_FIELDS:
+            if field in record:
+                record[field] = format_tw_date(record[field])
+        lines.append(json.dumps(record))
+
+    cmd = [
+        'task',
+        f'rc.data.location={TASK_DATA_DIR}',
+        'rc.verbose=nothing',
+        'rc.confirmation=off',
+        'rc.hooks=off',
+        'import',
+    ]
+    result = subprocess.run(cmd, input='\n'.join(lines) + '\n', text=True, capture_output=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"task import failed: {result.stderr.strip()}")
+
+
+def export_sync_tasks(filters, complete):
+    """Export tasks and collapse recurring ones into series
+
+    An incremental export may contain only part of a recurrence, so the
+    parents and pending children of every touched series are fetched in
+    one extra export before collapsing.
+    """
+    tasks = {task['uuid']: task for task in export_tasks(filters)}
+
+    if not complete:
+        parents = {task['parent'] for task in tasks.values() if task.get('parent')}
+        parents |= {uuid for uuid, task in tasks.items() if task.get('status') == 'recurring'}
+        if parents:
+            terms = []
+            for uuid in sorted(parents):
+                terms += ['or', f'uuid:{uuid}', 'or', f'parent:{uuid}']
+            for task in export_tasks(['(', *terms[1:], ')']):
+                tasks.setdefault(task['uuid'], task)
 
-    # Priority 1: +fire tag → Fire Map calendar
-    if 'fire' in task.get('tags', []):
-        return gcal_config.get('fire_map_cal_id')
+    tasks = list(tasks.values())
+    collapse_recurring(tasks)
+    return tasks
 
-    # Priority 2: domain:body → Trainingsplan calendar
-    domain = task.get('domain', '')
-    if domain == 'body':
-        return gcal_config.get('trainingsplan_cal_id')
 
-    # Priority 3: domain-specific calendars (if configured)
-    if domain in ['being', 'balance', 'business']:
-        cal_key = f'{domain}_cal_id'
-        cal_id = gcal_config.get(cal_key)
-        if cal_id:
-            return cal_id
+def parse_recur(recur):
+    """Map a Taskwarrior recur value to (FREQ, INTERVAL), None if unsupported"""
+    recur = (recur or '').strip().lower()
+    if recur in RECUR_NAMES:
+        return RECUR_NAMES[recur]
 
-    # Default calendar
-    return gcal_config.get('default_cal_id', 'primary')
+    iso = re.fullmatch(r'p(t?)(\d+)([hdwmy])', recur)
+    if iso:
+        unit = iso.group(3).upper()
+        if iso.group(1) and unit != 'H':
+            return None
+        return RECUR_ISO_UNITS[unit], int(iso.group(2))
+
+    numeric = re.fullmatch(r'(\d*)\s*([a-z]+)', recur)
+    if not numeric:
+        return None
+    count = int(numeric.group(1) or 1)
+    for freq, units in RECUR_UNITS.items():
+        if numeric.group(2) in units:
+            if freq == 'QUARTERLY':
+                return 'MONTHLY', 3 * count
+            return freq, count
+    return None
+
+
+def occurrence(start, freq, interval, index):
+    """Due date of the index-th occurrence (imask) of a recurrence
+
+    Computed in wall-clock time of the event time zone, the way Calendar
+    expands the RRULE, so DST changes do not shift occurrences.
+    """
+    zone = ZoneInfo(GCAL_TIMEZONE)
+    wall = start.astimezone(zone).replace(tzinfo=None)
+    step = interval * index
+
+    if freq == 'HOURLY':
+        return start + timedelta(hours=step)
+    if freq == 'DAILY':
+        wall += timedelta(days=step)
+    elif freq == 'WEEKLY':
+        wall += timedelta(weeks=step)
+    elif freq == 'WEEKDAYS':
+        for _ in range(index):
+            wall += timedelta(days=1)
+            while wall.weekday() >= 5:
+                wall += timedelta(days=1)
+    else:
+        months = step * (12 if freq == 'YEARLY' else 1)
+        year, month = divmod(wall.month - 1 + months, 12)
+        year += wall.year
+        day = min(wall.day, calendar.monthrange(year, month + 1)[1])
+        wall = wall.replace(year=year, month=month + 1, day=day)
+
+    return wall.replace(tzinfo=zone)
+
+
+def recurrence_rule(parent, freq, interval):
+    """RRULE line for a recurring parent task
+
+    Plain monthly/yearly RRULEs skip months too short for the start day,
+    while Taskwarrior clamps to the month's last day (occurrence()). Series
+    starting after the 28th therefore pick the last of the days 28..start
+    day that exists in each month.
+    """
+    if freq == 'WEEKDAYS':
+        rule = 'RRULE:FREQ=WEEKLY;BYDAY=MO,TU,WE,TH,FR'
+    else:
+        rule = f'RRULE:FREQ={freq}'
+        if interval > 1:
+            rule += f';INTERVAL={interval}'
+
+        start = parent['due'].astimezone(ZoneInfo(GCAL_TIMEZONE))
+        clamped = start.day > 28 and (freq == 'MONTHLY' or (freq == 'YEARLY' and start.month == 2))
+        if clamped:
+            if freq == 'YEARLY':
+                rule += ';BYMONTH=2'
+            days = ','.join(str(day) for day in range(28, start.day + 1))
+            rule += f';BYMONTHDAY={days};BYSETPOS=-1'
+    if parent.get('until'):
+        rule += f";UNTIL={format_tw_date(parent['until'])}"
+    return rule
+
+
+def collapse_recurring(tasks):
+    """Fold pending children of recurring parents into the parent's series
+
+    Parents with a supported recur value get `recurrence_rules` (RRULE
+    plus EXDATE for diverging occurrences). Children matching their slot
+    are marked with `recurrence_series` and produce no event of their own;
+    children whose due date or content diverge keep a standalone event
+    and their slot is excluded from the series.
+    """
+    series = {}
+    for task in tasks:
+        if task.get('status') == 'recurring' and task.get('due'):
+            rule = parse_recur(task.get('recur'))
+            if rule:
+                series[task['uuid']] = (task, rule, set())
+
+    zone = ZoneInfo(GCAL_TIMEZONE)
+    for task in tasks:
+        parent_uuid = task.get('parent')
+        if parent_uuid not in series or task.get('status') != 'pending':
+            continue
+
+        parent, (freq, interval), exdates = series[parent_uuid]
+        slot = occurrence(parent['due'], freq, interval, int(task.get('imask', 0)))
+        same_content = all(task.get(field) == parent.get(field) for field in RECUR_COMPARE_FIELDS)
+        same_tags = sorted(task.get('tags', [])) == sorted(parent.get('tags', []))
+        if task.get('due') == slot and same_content and same_tags:
+            task['recurrence_series'] = parent_uuid
+        else:
+            exdates.add(slot.astimezone(zone).strftime('%Y%m%dT%H%M%S'))
+
+    for parent, (freq, interval), exdates in series.values():
+        rules = [recurrence_rule(parent, freq, interval)]
+        if exdates:
+            rules.append(f"EXDATE;TZID={GCAL_TIMEZONE}:{','.join(sorted(exdates))}")
+        parent['recurrence_rules'] = rules
+
+
+def is_sync_candidate(task):
+    """Tasks to sync: pending AND (+fire OR has due date)
+
+    Recurring parents with a series count as candidates; their on-slot
+    children are covered by the series event.
+    """
+    if task.get('recurrence_series'):
+        return False
+    status = task.get('status', 'pending')
+    if status == 'recurring':
+        return bool(task.get('recurrence_rules'))
+    if status != 'pending':
+        return False
+    return 'fire' in task.get('tags', []) or bool(task.get('due'))
+
+
+def as_set(value):
+    """Rule match value (string or list) as a frozenset"""
+    return frozenset([value] if isinstance(value, str) else value)
+
+
+def compile_rule(rule, gcal_config, index):
+    """Resolve one routing rule against the config"""
+    name = rule.get('name', f'rule {index + 1}')
+    match = rule.get('match', {})
+    unknown = set(match) - set(ROUTING_MATCH_KEYS)
+    if unknown:
+        raise ValueError(f"Routing rule '{name}': unknown match keys {', '.join(sorted(unknown))}")
+
+    calendar = rule.get('calendar')
+    if 'calendar_key' in rule:
+        calendar = gcal_config.get(rule['calendar_key'], calendar)
+
+    return {
+        'name': name,
+        'tags': as_set(match.get('tags', [])),
+        'values': {field: as_set(match[field]) for field in ROUTING_MATCH_FIELDS if field in match},
+        'urgency_min': match.get('urgency_min'),
+        'urgency_max': match.get('urgency_max'),
+        'sets_calendar': 'calendar' in rule or 'calendar_key' in rule,
+        'calendar': calendar,
+        'fallthrough': rule.get('fallthrough', False),
+        'color': rule.get('color'),
+    }
+
+
+class Router:
+    """Routing rules compiled into a dispatch table
+
+    A task's route only depends on the tags the rules mention, the matched
+    fields and which urgency band it falls into, so routes are computed
+    once per distinct combination and looked up for every other task.
+    """
+
+    def __init__(self, rules, gcal_config):
+        self.rules = [compile_rule(rule, gcal_config, i) for i, rule in enumerate(rules)]
+        self.tags = frozenset().union(*(rule['tags'] for rule in self.rules))
+        self.fields = tuple(
+            field for field in ROUTING_MATCH_FIELDS
+            if any(field in rule['values'] for rule in self.rules)
+        )
+        self.thresholds = sorted({
+            rule[bound] for rule in self.rules for bound in ('urgency_min', 'urgency_max')
+            if rule[bound] is not None
+        })
+        self.routes = {}
+
+    def key(self, task):
+        urgency = None
+        if self.thresholds:
+            urgency = bisect.bisect_right(self.thresholds, task.get('urgency', 0))
+        return (
+            self.tags.intersection(task.get('tags', [])),
+            tuple(task.get(field) for field in self.fields),
+            urgency,
+        )
+
+    def matches(self, rule, task):
+        if not rule['tags'] <= set(task.get('tags', [])):
+            return False
+        for field, allowed in rule['values'].items():
+            value = task.get(field) or ''
+            if field == 'project':
+                # Like Taskwarrior, project:home also matches home.garden
+                if not any(value == p or value.startswith(p + '.') for p in allowed):
+                    return False
+            elif value not in allowed:
+                return False
+        urgency = task.get('urgency', 0)
+        if rule['urgency_min'] is not None and urgency < rule['urgency_min']:
+            return False
+        if rule['urgency_max'] is not None and urgency >= rule['urgency_max']:
+            return False
+        return True
+
+    def resolve(self, task):
+        route = {'calendar': None, 'calendar_rule': None, 'color': '7', 'color_rule': None}
+        calendar_done = color_done = False
+        for rule in self.rules:
+            if calendar_done and color_done:
+                break
+            if not self.matches(rule, task):
+                continue
+            if not calendar_done and rule['sets_calendar']:
+                if rule['calendar'] or not rule['fallthrough']:
+                    route['calendar'] = rule['calendar']
+                    route['calendar_rule'] = rule['name']
+                    calendar_done = True
+            if not color_done and rule['color']:
+                route['color'] = rule['color']
+                route['color_rule'] = rule['name']
+                color_done = True
+        return route
+
+    def route(self, task):
+        """Calendar, colour and the deciding rule names for a task"""
+        key = self.key(task)
+        route = self.routes.get(key)
+        if route is None:
+            route = self.routes[key] = self.resolve(task)
+        return route
+
+
+# Router compiled for the config object it was built from
+_router = None
+
+# Built-in rules for callers without a config
+DEFAULT_ROUTER = Router(DEFAULT_ROUTING_RULES, {})
+
+
+def get_router(config):
+    """Compiled routing rules for config, built once per loaded config"""
+    global _router
+    if _router is None or _router[0] is not config:
+        gcal_config = config.get('google_calendar', {})
+        rules = gcal_config.get('routing_rules', DEFAULT_ROUTING_RULES)
+        _router = (config, Router(rules, gcal_config))
+    return _router[1]
+
+
+def map_task_to_calendar(task, config):
+    """Determine which calendar a task should go to"""
+    return get_router(config).route(task)['calendar']
 
 
 def task_to_event(task, config):
     """Convert Taskwarrior task to Google Calendar event"""
 
-    description_lines = [f"Task ID: {task['id']}"]
+    description_lines = [f"Task ID: {task['uuid']}"]
 
     # Add AlphaOS metadata
     if task.get('pillar'):
@@ -132,45 +633,1014 @@ def task_to_event(task, config):
     # Due date
     due = task.get('due')
     if due:
-        start_time = due.isoformat()
+        start = {
+            'dateTime': due.isoformat(),
+            'timeZone': GCAL_TIMEZONE,
+        }
         # Default duration: 1 hour
-        end_time = (due + timedelta(hours=1)).isoformat()
+        end = {
+            'dateTime': (due + timedelta(hours=1)).isoformat(),
+            'timeZone': GCAL_TIMEZONE,
+        }
     else:
         # No due date, create all-day event for today
         today = datetime.now().date()
-        start_time = today.isoformat()
-        end_time = (today + timedelta(days=1)).isoformat()
+        start = {'date': today.isoformat()}
+        end = {'date': (today + timedelta(days=1)).isoformat()}
 
     event = {
         'summary': task['description'],
         'description': '\n'.join(description_lines),
-        'start': {
-            'dateTime': start_time,
-            'timeZone': 'Europe/Berlin',  # TODO: Make configurable
-        },
-        'end': {
-            'dateTime': end_time,
-            'timeZone': 'Europe/Berlin',
+        'start': start,
+        'end': end,
+        'colorId': get_router(config).route(task)['color'],
+        'extendedProperties': {
+            'private': {GCAL_UUID_PROPERTY: task['uuid']},
         },
-        'colorId': get_color_for_domain(task.get('domain')),
     }
 
+    # Recurring parent: one series event instead of one per occurrence
+    if task.get('recurrence_rules'):
+        event['recurrence'] = task['recurrence_rules']
+
     return event
 
 
 def get_color_for_domain(domain):
     """Map AlphaOS domain to Google Calendar color"""
-    color_map = {
-        'body': '4',    # Red
-        'being': '9',   # Blue
-        'balance': '5', # Yellow
-        'business': '2', # Green
+    return DEFAULT_ROUTER.route({'domain': domain})['color']
+
+
+def load_sync_state():
+    """Load the task uuid → calendar event index from the last sync"""
+    if not GCAL_STATE_FILE.exists():
+        return {'tasks': {}, 'calendars': {}}
+
+    try:
+        with open(GCAL_STATE_FILE, 'r') as f:
+            state = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"WARNING: Ignoring unreadable sync state {GCAL_STATE_FILE}: {e}", file=sys.stderr)
+        return {'tasks': {}, 'calendars': {}}
+
+    state.setdefault('tasks', {})
+    state.setdefault('calendars', {})
+
+    # Older indexes stored bare event ids; force a full pull to get fields
+    for cal_state in state['calendars'].values():
+        if any(isinstance(event, str) for event in cal_state.get('events', {}).values()):
+            cal_state.clear()
+
+    return state
+
+
+def save_sync_state(state):
+    """Atomically write the sync state index"""
+    CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_file = GCAL_STATE_FILE.with_suffix('.tmp')
+    with open(tmp_file, 'w') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp_file, GCAL_STATE_FILE)
+
+
+def event_hash(event):
+    """Stable content hash of a task_to_event() body"""
+    payload = json.dumps(event, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class MutationJournal:
+    """Write-ahead log of the planned calendar mutations
+
+    Plans are appended (and fsynced) before they are pushed. Once a run
+    is done, plans that went through or failed for good are dropped and
+    the file is compacted; what is left after a network or API outage is
+    replayed in order, ahead of new work, by the next run. Replays go
+    through the usual pull-and-resolve step, so a mutation that reached
+    Google before the connection dropped becomes a no-op, not a duplicate.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or GCAL_JOURNAL_FILE
+        self.pending = {}
+        self.load()
+
+    def load(self):
+        """Read the open entries, the latest one per task winning"""
+        try:
+            f = open(self.path, 'r')
+        except FileNotFoundError:
+            return
+        with f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Torn last line from a crash mid-append
+                    continue
+                self.pending.pop(entry['uuid'], None)
+                self.pending[entry['uuid']] = entry
+
+    def queue(self, plans, tasks, complete):
+        """Journal new plans; returns the open replays followed by them
+
+        Exported tasks were just planned from their current state, so
+        their journaled entries are stale; after a complete export all are.
+        """
+        if complete:
+            self.pending.clear()
+        for task in tasks:
+            self.pending.pop(task['uuid'], None)
+        replays = [journal_plan(entry) for entry in self.pending.values()]
+
+        entries = []
+        for plan in plans:
+            entry = {'action': plan['action'], 'uuid': plan['uuid'], 'cal_id': plan['cal_id']}
+            if plan['action'] == 'delete':
+                entry['event_id'] = plan['event_id']
+            else:
+                entry['event'] = plan['event']
+                entry['hash'] = plan['hash']
+            self.pending[plan['uuid']] = entry
+            entries.append(entry)
+
+        if entries:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'a') as f:
+                for entry in entries:
+                    f.write(json.dumps(entry) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+
+        return replays + plans
+
+    def settle(self, plans):
+        """Drop plans that are done or failed for good, then compact"""
+        for plan in plans:
+            error = plan.get('error')
+            if plan.get('synced'):
+                self.pending.pop(plan['uuid'], None)
+            elif error is not None and not is_transient(error):
+                if self.pending.pop(plan['uuid'], None):
+                    print(f"WARNING: Not replaying task {plan['uuid']} "
+                          f"({type(error).__name__}: {error})", file=sys.stderr)
+
+        if not self.pending:
+            self.path.unlink(missing_ok=True)
+            return
+        tmp_file = self.path.with_suffix('.tmp')
+        with open(tmp_file, 'w') as f:
+            for entry in self.pending.values():
+                f.write(json.dumps(entry) + '\n')
+        os.replace(tmp_file, self.path)
+
+    def covers(self, plans):
+        """True when every plan either synced or is still journaled"""
+        return all(plan.get('synced') or plan['uuid'] in self.pending for plan in plans)
+
+
+def journal_plan(entry):
+    """Rebuild a plan from a journal entry for replay"""
+    plan = dict(entry, task=None)
+    if entry['action'] != 'delete':
+        plan['task'] = {'uuid': entry['uuid'], 'description': entry['event'].get('summary', '')}
+    return plan
+
+
+def http_status(error):
+    """HTTP status of a googleapiclient HttpError, None for other errors"""
+    resp = getattr(error, 'resp', None)
+    status = getattr(resp, 'status', None)
+    return int(status) if status is not None else None
+
+
+def error_reason(error):
+    """First error reason from a googleapiclient HttpError body"""
+    try:
+        details = json.loads(getattr(error, 'content', b'') or b'{}')
+    except (TypeError, ValueError):
+        return None
+    errors = details.get('error', {}).get('errors', [])
+    return errors[0].get('reason') if errors else None
+
+
+def is_retryable(error):
+    """Quota errors (403 rateLimitExceeded, 429), 5xx and network errors"""
+    status = http_status(error)
+    if status is None:
+        return isinstance(error, OSError)
+    if status == 429 or status >= 500:
+        return True
+    return status == 403 and error_reason(error) in GCAL_RETRY_REASONS
+
+
+def transport_errors():
+    """Exception types of a failed connection, for the HTTP stack in use
+
+    The Google libraries are only consulted when already imported, so
+    classifying an error never pulls them in.
+    """
+    errors = [OSError]
+    httplib2 = sys.modules.get('httplib2')
+    if httplib2 is not None:
+        errors.append(httplib2.HttpLib2Error)
+    auth_exceptions = sys.modules.get('google.auth.exceptions')
+    if auth_exceptions is not None:
+        errors.append(auth_exceptions.TransportError)
+    return tuple(errors)
+
+
+def is_transient(error):
+    """Failures worth replaying later: retryable API errors and transport errors
+
+    Anything else (a rejected event, a bug) would fail the same way on
+    every replay.
+    """
+    return is_retryable(error) or isinstance(error, transport_errors())
+
+
+def backoff_delay(attempt):
+    """Exponential backoff with full jitter"""
+    return random.uniform(0, min(GCAL_BACKOFF_CAP, GCAL_BACKOFF_BASE * 2 ** attempt))
+
+
+class RateLimiter:
+    """Token bucket shared by all sync workers
+
+    Callers reserve tokens up front and sleep until the reservation is
+    covered, so concurrent workers together stay at `rate` requests/second.
+    """
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= tokens
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+
+class SyncMetrics:
+    """Wall time per phase, API call and task counters for one sync run
+
+    Phases running in several calendar workers (pull, push) add up their
+    time, so they can exceed the run's wall time.
+    """
+
+    def __init__(self, mode):
+        self.mode = mode
+        self.started = datetime.now(timezone.utc)
+        self.started_clock = time.perf_counter()
+        self.phases = {}
+        self.api_calls = {}
+        self.http_requests = 0
+        self.retries = 0
+        self.bytes_sent = 0
+        self.tasks = {}
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - started
+
+    def count_call(self, meta):
+        """One API call attempt, meta = (method, calendar id, body bytes)"""
+        method, cal_id, size = meta
+        with self.lock:
+            by_method = self.api_calls.setdefault(cal_id, {})
+            by_method[method] = by_method.get(method, 0) + 1
+            self.bytes_sent += size
+
+    def count_http(self, retry=False):
+        with self.lock:
+            self.http_requests += 1
+            if retry:
+                self.retries += 1
+
+    def count_retries(self, count):
+        """Sub-requests re-sent inside a batch (the batch is one HTTP request)"""
+        with self.lock:
+            self.retries += count
+
+    def count_tasks(self, key, count=1):
+        with self.lock:
+            self.tasks[key] = self.tasks.get(key, 0) + count
+
+    def report(self):
+        by_method = {}
+        for calls in self.api_calls.values():
+            for method, count in calls.items():
+                by_method[method] = by_method.get(method, 0) + count
+        return {
+            'started': self.started.isoformat(),
+            'mode': self.mode,
+            'wall_seconds': round(time.perf_counter() - self.started_clock, 3),
+            'phases': {name: round(seconds, 3) for name, seconds in self.phases.items()},
+            'api_calls': {
+                'total': sum(by_method.values()),
+                'by_method': by_method,
+                'by_calendar': self.api_calls,
+            },
+            'http_requests': self.http_requests,
+            'retries': self.retries,
+            'bytes_sent': self.bytes_sent,
+            'tasks': self.tasks,
+        }
+
+
+def emit_metrics(metrics, show, history, stream=None):
+    """Print the metrics report (to stream, default stdout) and/or append it to the history file"""
+    report = metrics.report()
+    if show:
+        print(json.dumps(report, indent=2), file=stream or sys.stdout, flush=True)
+    if history:
+        try:
+            GCAL_METRICS_FILE.parent.mkdir(parents=True, exist_ok=True)
+            with open(GCAL_METRICS_FILE, 'a') as f:
+                f.write(json.dumps(report) + '\n')
+        except OSError as e:
+            print(f"WARNING: Could not write metrics history: {e}", file=sys.stderr)
+
+
+class CalendarClient:
+    """Calendar service wrapper shared by the sync workers
+
+    Adds the rate limiter, retries with jittered backoff, call metrics
+    and a pool of HTTP connections. httplib2 objects are not thread-safe,
+    so each request checks one out; the pool lives as long as the client,
+    so workers of later syncs (--watch) reuse the open TLS connections.
+    """
+
+    def __init__(self, service, limiter, max_retries=GCAL_MAX_RETRIES, metrics=None):
+        self.service = service
+        self.limiter = limiter
+        self.max_retries = max_retries
+        self.metrics = metrics or SyncMetrics('unknown')
+        self._connections = queue.LifoQueue()
+
+    def request(self, method, **params):
+        """Build an events.<method> request tagged for the call metrics"""
+        request = getattr(self.service.events(), method)(**params)
+        body = params.get('body')
+        size = len(json.dumps(body).encode('utf-8')) if body is not None else 0
+        request.sync_meta = (method, params.get('calendarId'), size)
+        return request
+
+    def _new_http(self):
+        """Authorized HTTP object sharing the service's credentials"""
+        credentials = getattr(getattr(self.service, '_http', None), 'credentials', None)
+        if credentials is None:
+            return None
+        import google_auth_httplib2
+        import httplib2
+        return google_auth_httplib2.AuthorizedHttp(credentials, http=httplib2.Http())
+
+    @contextmanager
+    def _http(self):
+        """Check an HTTP object out of the pool, creating one if all are busy"""
+        try:
+            http = self._connections.get_nowait()
+        except queue.Empty:
+            http = self._new_http()
+        try:
+            yield http
+        finally:
+            self._connections.put(http)
+
+    def execute(self, request):
+        """Execute one API request, retrying quota and server errors"""
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire()
+            self.metrics.count_http(retry=attempt > 0)
+            self.metrics.count_call(request.sync_meta)
+            try:
+                with self._http() as http:
+                    return request.execute(http=http)
+            except Exception as e:
+                if attempt == self.max_retries or not is_retryable(e):
+                    raise
+                time.sleep(backoff_delay(attempt))
+
+    def execute_batched(self, requests):
+        """Execute (request_id, request) pairs as Calendar API batch requests
+
+        Returns a dict mapping each request_id to a (response, exception)
+        tuple, so callers can report failures per sub-request. Sub-requests
+        failing with a retryable error are re-sent in a later batch.
+        """
+        results = {}
+
+        def collect(request_id, response, exception):
+            results[request_id] = (response, exception)
+
+        pending = list(requests)
+        for attempt in range(self.max_retries + 1):
+            for start in range(0, len(pending), GCAL_BATCH_SIZE):
+                chunk = pending[start:start + GCAL_BATCH_SIZE]
+                # Every sub-request counts against the quota
+                self.limiter.acquire(len(chunk))
+                self.metrics.count_http()
+                if attempt > 0:
+                    self.metrics.count_retries(len(chunk))
+                batch = self.service.new_batch_http_request(callback=collect)
+                for request_id, request in chunk:
+                    self.metrics.count_call(request.sync_meta)
+                    batch.add(request, request_id=request_id)
+                try:
+                    with self._http() as http:
+                        batch.execute(http=http)
+                except Exception as e:
+                    for request_id, _ in chunk:
+                        results[request_id] = (None, e)
+
+            pending = [
+                (request_id, request) for request_id, request in pending
+                if results[request_id][1] is not None and is_retryable(results[request_id][1])
+            ]
+            if not pending or attempt == self.max_retries:
+                break
+            time.sleep(backoff_delay(attempt))
+
+        return results
+
+
+def remote_fields(item):
+    """Compact copy of a remote event kept in the calendar index"""
+    fields = {field: item[field] for field in EVENT_SYNC_FIELDS if field in item}
+    fields['id'] = item['id']
+    for field in ('etag', 'updated'):
+        if field in item:
+            fields[field] = item[field]
+    return fields
+
+
+def normalize_field(field, value):
+    """Comparable form of an event field
+
+    Google echoes dateTime values in its own offset notation, so times are
+    compared as UTC instants rather than strings.
+    """
+    if field in ('start', 'end') and value:
+        if 'dateTime' in value:
+            moment = datetime.fromisoformat(value['dateTime'].replace('Z', '+00:00'))
+            return {'dateTime': moment.astimezone(timezone.utc), 'timeZone': value.get('timeZone')}
+        return {'date': value.get('date')}
+    return value
+
+
+def patch_value(field, value):
+    """Value of a field in an events.patch body
+
+    Patch merges nested objects, so start/end must null the keys they do
+    not use; otherwise turning a timed event into an all-day one (or back)
+    leaves both date and dateTime set and the API rejects the event.
+    """
+    if field in ('start', 'end') and value:
+        return {'date': None, 'dateTime': None, 'timeZone': None, **value}
+    return value
+
+
+def diff_event(desired, remote):
+    """Fields of the desired event that differ from the remote event, as a patch body"""
+    return {
+        field: patch_value(field, desired.get(field))
+        for field in EVENT_SYNC_FIELDS
+        if normalize_field(field, desired.get(field)) != normalize_field(field, remote.get(field))
     }
-    return color_map.get(domain, '7')  # Default: gray
 
 
-def sync_tasks_to_gcal(dry_run=False):
+def pull_calendar(client, cal_id, cal_state, legacy=None):
+    """Update the uuid → remote event index of one calendar
+
+    The first pull lists the whole calendar, later pulls pass the stored
+    syncToken so only events changed since then are returned. An expired
+    token (410 Gone) falls back to a full listing. Returns the (uuid, event)
+    pairs of the listed events that still exist.
+
+    On full listings, events written by the old script (no uuid property)
+    are appended to `legacy` so they can be adopted instead of duplicated.
+    """
+    events = cal_state.setdefault('events', {})
+    sync_token = cal_state.get('sync_token')
+    if not sync_token:
+        events.clear()
+
+    changed = []
+    page_token = None
+    while True:
+        params = {'calendarId': cal_id, 'pageToken': page_token, 'maxResults': 2500}
+        if sync_token:
+            params['syncToken'] = sync_token
+        else:
+            params['showDeleted'] = False
+
+        try:
+            result = client.execute(client.request('list', **params))
+        except Exception as e:
+            if sync_token and http_status(e) == 410:
+                print(f"  Sync token expired for {cal_id}, doing full pull")
+                cal_state.pop('sync_token', None)
+                return pull_calendar(client, cal_id, cal_state, legacy)
+            raise
+
+        with STATE_LOCK:
+            for item in result.get('items', []):
+                private = item.get('extendedProperties', {}).get('private', {})
+                uuid = private.get(GCAL_UUID_PROPERTY)
+                if not uuid:
+                    if legacy is not None and not sync_token and is_legacy_event(item):
+                        legacy.append(item)
+                    continue
+                if item.get('status') == 'cancelled':
+                    events.pop(uuid, None)
+                else:
+                    events[uuid] = remote_fields(item)
+                    changed.append((uuid, item))
+
+        page_token = result.get('nextPageToken')
+        if not page_token:
+            cal_state['sync_token'] = result.get('nextSyncToken')
+            return changed
+
+
+def is_legacy_event(item):
+    """Event created by the pre-index script for a task"""
+    return (
+        item.get('status') != 'cancelled'
+        and LEGACY_DESCRIPTION.match(item.get('description') or '') is not None
+    )
+
+
+def legacy_key(event):
+    """Match key for adopting legacy events: summary and start
+
+    All-day events were dated on the day they were created, so for those
+    only the summary has to match.
+    """
+    start = normalize_field('start', event.get('start'))
+    if not start or 'dateTime' not in start:
+        return (event.get('summary'), None)
+    return (event.get('summary'), start['dateTime'])
+
+
+def index_legacy(items):
+    """Legacy events of one calendar grouped by legacy_key()"""
+    index = {}
+    for item in items:
+        index.setdefault(legacy_key(item), []).append(item)
+    return index
+
+
+def plan_sync(tasks, config, state, complete):
+    """Work out which tasks need a calendar mutation
+
+    `tasks` is the exported set; with `complete` it holds every pending
+    and recurring task, so tracked tasks missing from it have left the candidate set.
+    Otherwise only exported tasks that are no longer candidates (done,
+    deleted, untagged) are removed.
+
+    Returns (plans, skipped). Each plan has uuid, task, cal_id, event,
+    hash and action ('sync' or 'delete'); pushes resolve 'sync' into
+    insert, patch, move or nothing after pulling the calendar.
+    """
+    router = get_router(config)
+    plans = []
+    skipped = 0
+    seen = set()
+    for task in tasks:
+        uuid = task['uuid']
+        seen.add(uuid)
+        entry = state['tasks'].get(uuid)
+
+        cal_id = router.route(task)['calendar'] if is_sync_candidate(task) else None
+        if not cal_id:
+            if entry:
+                plans.append(delete_plan(uuid, entry))
+            elif is_sync_candidate(task):
+                print(f"WARNING: No calendar for task {uuid}, skipping", file=sys.stderr)
+            continue
+
+        event = task_to_event(task, config)
+        digest = event_hash(event)
+        if entry and entry.get('calendar_id') == cal_id and entry.get('hash') == digest:
+            skipped += 1
+            continue
+
+        plans.append({
+            'uuid': uuid,
+            'task': task,
+            'cal_id': cal_id,
+            'event': event,
+            'hash': digest,
+            'action': 'sync',
+        })
+
+    if complete:
+        for uuid, entry in state['tasks'].items():
+            if uuid not in seen:
+                plans.append(delete_plan(uuid, entry))
+
+    return plans, skipped
+
+
+def delete_plan(uuid, entry):
+    """Plan removing the event of a task that left the candidate set"""
+    return {
+        'uuid': uuid,
+        'task': None,
+        'cal_id': entry['calendar_id'],
+        'event_id': entry['event_id'],
+        'action': 'delete',
+    }
+
+
+def resolve_plan(plan, state, cal_state, legacy=None):
+    """Turn a 'sync' plan into the minimal mutation against remote state
+
+    `legacy` is the index_legacy() of the calendar's legacy events; a
+    matching one is adopted (patched with the uuid) rather than inserted.
+    """
+    uuid = plan['uuid']
+    remote = cal_state['events'].get(uuid)
+    if remote:
+        plan['event_id'] = remote['id']
+        plan['changes'] = diff_event(plan['event'], remote)
+        plan['action'] = 'patch' if plan['changes'] else 'noop'
+        return
+
+    # Event lives in the calendar the task was routed to before
+    entry = state['tasks'].get(uuid)
+    if entry and entry.get('calendar_id') != plan['cal_id'] and entry.get('event_id'):
+        with STATE_LOCK:
+            source_events = state['calendars'].get(entry['calendar_id'], {}).get('events', {})
+            source_remote = source_events.get(uuid)
+        plan['action'] = 'move'
+        plan['source_cal'] = entry['calendar_id']
+        plan['event_id'] = entry['event_id']
+        plan['changes'] = diff_event(plan['event'], source_remote or {})
+        return
+
+    candidates = legacy.get(legacy_key(plan['event'])) if legacy else None
+    if candidates:
+        item = candidates.pop(0)
+        plan['event_id'] = item['id']
+        plan['changes'] = diff_event(plan['event'], remote_fields(item))
+        plan['changes']['extendedProperties'] = plan['event']['extendedProperties']
+        plan['action'] = 'patch'
+        plan['adopted'] = True
+        return
+
+    plan['action'] = 'insert'
+
+
+def record_synced(state, plan, remote):
+    """Store the synced event for a task in the state index"""
+    with STATE_LOCK:
+        cal_state = state['calendars'].setdefault(plan['cal_id'], {})
+        cal_state.setdefault('events', {})[plan['uuid']] = remote
+        state['tasks'][plan['uuid']] = {
+            'calendar_id': plan['cal_id'],
+            'event_id': remote['id'],
+            'hash': plan['hash'],
+            'etag': remote.get('etag'),
+        }
+
+
+def record_deleted(state, plan):
+    """Forget a task whose event was removed"""
+    with STATE_LOCK:
+        state['tasks'].pop(plan['uuid'], None)
+        cal_state = state['calendars'].get(plan['cal_id'], {})
+        cal_state.get('events', {}).pop(plan['uuid'], None)
+
+
+def record_failed(state, plan):
+    """Keep the event ids of a failed task but force a retry next run"""
+    with STATE_LOCK:
+        entry = state['tasks'].get(plan['uuid'])
+        if entry and plan['action'] != 'delete':
+            entry['hash'] = None
+
+
+def run_mutations(client, mutations, batch):
+    """Execute (request_id, request) pairs, batched or one at a time
+
+    Returns a dict mapping each request_id to a (response, exception) tuple.
+    """
+    if batch:
+        return client.execute_batched(mutations)
+
+    results = {}
+    for request_id, request in mutations:
+        try:
+            results[request_id] = (client.execute(request), None)
+        except Exception as e:
+            results[request_id] = (None, e)
+    return results
+
+
+def mutation_request(client, plan):
+    """Calendar API request for a resolved insert/patch/delete plan"""
+    if plan['action'] == 'insert':
+        return client.request('insert', calendarId=plan['cal_id'], body=plan['event'])
+    if plan['action'] == 'patch':
+        return client.request(
+            'patch', calendarId=plan['cal_id'], eventId=plan['event_id'], body=plan['changes']
+        )
+    return client.request('delete', calendarId=plan['cal_id'], eventId=plan['event_id'])
+
+
+def push_calendar(client, cal_id, plans, state, batch):
+    """Send the minimal mutation set for one calendar
+
+    Moves go first since a moved event may still need a patch; inserts,
+    patches and deletes follow together. Returns the number of tasks that
+    are in sync afterwards.
+    """
+    labels = {'insert': 'Created', 'patch': 'Updated'}
+    synced_count = 0
+
+    # Phase 1: move events between calendars
+    moves = [plan for plan in plans if plan['action'] == 'move']
+    results = run_mutations(client, [
+        (plan['uuid'], client.request(
+            'move',
+            calendarId=plan['source_cal'],
+            eventId=plan['event_id'],
+            destination=cal_id
+        ))
+        for plan in moves
+    ], batch)
+    for plan in moves:
+        response, error = results[plan['uuid']]
+        if error:
+            if http_status(error) in (404, 410):
+                # Event is gone from the old calendar, recreate it here
+                plan['action'] = 'insert'
+                del plan['source_cal']
+                continue
+            record_failed(state, plan)
+            plan['error'] = error
+            client.metrics.count_tasks('failed')
+            print(f"ERROR moving task {plan['uuid']}: {error}", file=sys.stderr)
+            continue
+
+        with STATE_LOCK:
+            state['calendars'].get(plan['source_cal'], {}).get('events', {}).pop(plan['uuid'], None)
+        plan['event_id'] = response['id']
+        if plan['changes']:
+            plan['action'] = 'patch'
+        else:
+            record_synced(state, plan, remote_fields(response))
+            plan['synced'] = True
+            client.metrics.count_tasks('moved')
+            print(f"  ✓ Moved: {plan['task']['description']}")
+            synced_count += 1
+
+    # Phase 2: inserts, field patches and deletions
+    pending = [plan for plan in plans if plan['action'] in ('insert', 'patch', 'delete')]
+    results = run_mutations(
+        client, [(plan['uuid'], mutation_request(client, plan)) for plan in pending], batch
+    )
+    for plan in pending:
+        response, error = results[plan['uuid']]
+        if plan['action'] == 'delete':
+            if error and http_status(error) not in (404, 410):
+                plan['error'] = error
+                client.metrics.count_tasks('failed')
+                print(f"ERROR deleting event of task {plan['uuid']}: {error}", file=sys.stderr)
+                continue
+            remote = state['calendars'][cal_id].get('events', {}).get(plan['uuid'], {})
+            record_deleted(state, plan)
+            client.metrics.count_tasks('deleted')
+            print(f"  ✓ Deleted: {remote.get('summary', plan['uuid'])}")
+        else:
+            if error:
+                record_failed(state, plan)
+                plan['error'] = error
+                client.metrics.count_tasks('failed')
+                print(f"ERROR syncing task {plan['uuid']}: {error}", file=sys.stderr)
+                continue
+            record_synced(state, plan, remote_fields(response))
+            if plan.get('adopted'):
+                label = 'Adopted'
+            elif plan.get('source_cal'):
+                label = 'Moved'
+            else:
+                label = labels[plan['action']]
+            client.metrics.count_tasks(label.lower())
+            print(f"  ✓ {label}: {plan['task']['description']}")
+        plan['synced'] = True
+        synced_count += 1
+
+    # Remote already matches (e.g. fixed by hand): just remember the hash
+    for plan in plans:
+        if plan['action'] == 'noop':
+            record_synced(state, plan, state['calendars'][cal_id]['events'][plan['uuid']])
+            plan['synced'] = True
+            client.metrics.count_tasks('in_sync')
+            synced_count += 1
+
+    return synced_count
+
+
+def sync_calendar(client, cal_id, plans, state, batch, legacy):
+    """Worker: pull one calendar's index and push its planned mutations
+
+    `legacy` holds the calendar's legacy events, including any collected
+    by an earlier full listing in the same run.
+    """
+    cal_state = state['calendars'][cal_id]
+    with client.metrics.phase('pull'):
+        pull_calendar(client, cal_id, cal_state, legacy)
+        adoptable = index_legacy(legacy)
+        for plan in plans:
+            if plan['action'] == 'sync':
+                resolve_plan(plan, state, cal_state, adoptable)
+
+    with client.metrics.phase('push'):
+        return push_calendar(client, cal_id, plans, state, batch)
+
+
+def sync_calendars(client, plans, state, batch, workers, legacy=None):
+    """Sync all affected calendars in parallel, one worker per calendar
+
+    Moves are handled by the destination calendar's worker. `legacy` maps
+    calendar ids to legacy events already listed in this run.
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    by_calendar = {}
+    for plan in plans:
+        by_calendar.setdefault(plan['cal_id'], []).append(plan)
+        state['calendars'].setdefault(plan['cal_id'], {})
+    legacy = legacy if legacy is not None else {}
+
+    synced_count = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(
+                sync_calendar, client, cal_id, cal_plans, state, batch, legacy.setdefault(cal_id, [])
+            ): cal_id
+            for cal_id, cal_plans in by_calendar.items()
+        }
+        for future in as_completed(futures):
+            try:
+                synced_count += future.result()
+            except Exception as e:
+                print(f"ERROR syncing calendar {futures[future]}: {e}", file=sys.stderr)
+                for plan in by_calendar[futures[future]]:
+                    if not plan.get('synced'):
+                        plan.setdefault('error', e)
+
+    return synced_count
+
+
+def event_edits(task, item):
+    """Task changes for a calendar-side edit of its event
+
+    The event start becomes the due date and the title the description.
+    Edits older than the task's last local modification lose; the push
+    overwrites them instead.
+    """
+    updated = item.get('updated')
+    if updated and task.get('modified'):
+        if task['modified'] > datetime.fromisoformat(updated.replace('Z', '+00:00')):
+            return {}
+
+    changes = {}
+    summary = item.get('summary')
+    if summary and summary != task['description']:
+        changes['description'] = summary
+
+    start = item.get('start', {}).get('dateTime')
+    if start:
+        due = datetime.fromisoformat(start.replace('Z', '+00:00')).astimezone()
+        if due != task.get('due'):
+            changes['due'] = due
+    return changes
+
+
+def pull_calendar_edits(client, cal_id, state, legacy=None):
+    """Worker: events of one calendar edited outside the sync
+
+    Our own writes record the etag Google returned, so an indexed event
+    with a different etag was changed by someone else. The whole index is
+    compared, not just this pull's delta: a plain sync advances the same
+    syncToken without pulling edits back. Series events are skipped;
+    moving a whole recurrence is not mapped back.
+    """
+    cal_state = state['calendars'][cal_id]
+    pull_calendar(client, cal_id, cal_state, legacy)
+
+    edits = {}
+    with STATE_LOCK:
+        for uuid, item in cal_state['events'].items():
+            entry = state['tasks'].get(uuid)
+            if not entry or entry.get('calendar_id') != cal_id or not entry.get('etag'):
+                continue
+            if item.get('etag') != entry['etag'] and not item.get('recurrence'):
+                edits[uuid] = dict(item)
+    return edits
+
+
+def pull_to_taskwarrior(client, state, workers, legacy=None):
+    """Write calendar-side edits of synced events back to Taskwarrior
+
+    Every calendar that holds synced events is pulled with its syncToken
+    and its index checked for foreign etags; the affected tasks are
+    fetched in one export and written back in one import. Returns the number of tasks updated. Legacy events met on
+    full listings are collected per calendar in `legacy` for the push.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    cal_ids = list(state['calendars'])
+    legacy = legacy if legacy is not None else {}
+    edits = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            cal_id: pool.submit(pull_calendar_edits, client, cal_id, state, legacy.setdefault(cal_id, []))
+            for cal_id in cal_ids
+        }
+        for cal_id, future in futures.items():
+            try:
+                edits.update(future.result())
+            except Exception as e:
+                print(f"ERROR pulling calendar {cal_id}: {e}", file=sys.stderr)
+    if not edits:
+        return 0
+
+    updated = []
+    now = datetime.now(timezone.utc)
+    for task in export_tasks(sorted(edits)):
+        changes = event_edits(task, edits[task['uuid']])
+        if not changes:
+            continue
+        print(f"  ✓ Pulled: {task['description']} ({', '.join(sorted(changes))})")
+        task.update(changes, modified=now)
+        updated.append(task)
+
+    if updated:
+        import_tasks(updated)
+
+    # Edits are in Taskwarrior now (or lost to a newer local change)
+    with STATE_LOCK:
+        for uuid, item in edits.items():
+            state['tasks'][uuid]['etag'] = item.get('etag')
+    return len(updated)
+
+
+def make_client(service, config, metrics=None):
+    """Wrap a Calendar service with the configured rate limit and retries"""
+    gcal_config = config['google_calendar']
+    limiter = RateLimiter(
+        gcal_config.get('rate_limit_qps', GCAL_DEFAULT_QPS),
+        gcal_config.get('rate_limit_burst', GCAL_DEFAULT_BURST)
+    )
+    return CalendarClient(
+        service, limiter, gcal_config.get('max_retries', GCAL_MAX_RETRIES), metrics
+    )
+
+
+def next_watermark(run_started):
+    """Watermark for the next run
+
+    Taskwarrior dates have second resolution and modified.after is strict,
+    so back off one second; re-exporting a task is cheap, missing one is not.
+    """
+    return format_tw_date(run_started - timedelta(seconds=1))
+
+
+def sync_tasks_to_gcal(dry_run=False, batch=False, since_last=False, pull=False,
+                       explain=False, show_metrics=False, metrics_history=False):
     """Main sync function"""
+    metrics = SyncMetrics('incremental' if since_last else 'full')
+    # With --metrics stdout carries only the JSON report
+    report_stream = sys.stdout
+    try:
+        with redirect_stdout(sys.stderr) if show_metrics else nullcontext():
+            return run_sync(metrics, dry_run, batch, since_last, pull, explain)
+    finally:
+        if show_metrics or metrics_history:
+            emit_metrics(metrics, show_metrics, metrics_history, report_stream)
+
+
+def run_sync(metrics, dry_run, batch, since_last, pull=False, explain=False):
+    """One-shot sync run, recording phase timings and counts in metrics"""
 
     print("[ClaudeWarrior] Starting Taskwarrior → Google Calendar sync...")
 
@@ -182,99 +1652,333 @@ def sync_tasks_to_gcal(dry_run=False):
         print(f"Enable it in {CONFIG_FILE}")
         return 0
 
-    # Initialize Taskwarrior
-    tw = TaskWarrior(data_location=str(Path.home() / '.task'))
+    try:
+        router = get_router(config)
+    except (TypeError, ValueError) as e:
+        print(f"ERROR: Invalid routing_rules in {CONFIG_FILE}: {e}", file=sys.stderr)
+        return 1
 
-    # Get tasks to sync: +fire OR has due date
-    # Filter out completed tasks
-    sync_candidates = []
+    state = load_sync_state()
+    gcal_config = config['google_calendar']
+    workers = gcal_config.get('workers', GCAL_DEFAULT_WORKERS)
+    client = None
+    # Events of the pre-index script, adopted by the push (calendar id → events)
+    legacy = {}
 
-    # Method 1: Tasks with +fire tag
-    fire_tasks = tw.tasks.filter(tags__contains='fire', status='pending')
-    sync_candidates.extend(fire_tasks)
+    # Calendar-side edits first, so the push below does not undo them.
+    # Previews stay offline: no OAuth, no listing, no `task import`
+    if (pull or gcal_config.get('pull_changes', False)) and (dry_run or explain):
+        print("Skipping calendar pull for this preview")
+    elif pull or gcal_config.get('pull_changes', False):
+        try:
+            with metrics.phase('auth'):
+                client = make_client(get_gcal_service(), config, metrics)
+            with metrics.phase('pull_back'):
+                pulled = pull_to_taskwarrior(client, state, workers, legacy)
+        except (OSError, RuntimeError) as e:
+            print(f"ERROR: {e}", file=sys.stderr)
+            return 1
+        metrics.count_tasks('pulled', pulled)
+        print(f"Pulled {pulled} calendar edits into Taskwarrior")
 
-    # Method 2: Tasks with due date
-    due_tasks = tw.tasks.filter(status='pending')
-    due_tasks = [t for t in due_tasks if t.get('due')]
-    sync_candidates.extend(due_tasks)
+    # Single export pass over pending tasks, or with a watermark over every
+    # task modified since the last successful sync (any status, so
+    # completed and deleted tasks can be removed from the calendar)
+    complete = not (since_last and state.get('watermark'))
+    if complete:
+        filters = ['(', 'status:pending', 'or', 'status:recurring', ')']
+    else:
+        filters = [f"modified.after:{state['watermark']}"]
+        print(f"Only tasks modified since {state['watermark']}")
 
-    # Deduplicate
-    seen = set()
-    unique_tasks = []
-    for task in sync_candidates:
-        task_id = task['uuid']
-        if task_id not in seen:
-            seen.add(task_id)
-            unique_tasks.append(task)
+    run_started = datetime.now(timezone.utc)
+    try:
+        with metrics.phase('export'):
+            tasks = export_sync_tasks(filters, complete)
+    except (OSError, RuntimeError) as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+
+    candidates = [task for task in tasks if is_sync_candidate(task)]
+    metrics.count_tasks('exported', len(tasks))
+    metrics.count_tasks('candidates', len(candidates))
+    print(f"Found {len(candidates)} tasks to sync")
 
-    print(f"Found {len(unique_tasks)} tasks to sync")
+    if explain:
+        print("\n[EXPLAIN] Routing:")
+        for task in candidates:
+            route = router.route(task)
+            print(f"  - {task['description']} → {route['calendar']} "
+                  f"(rule: {route['calendar_rule']}), color {route['color']} "
+                  f"(rule: {route['color_rule']})")
+        return 0
 
     if dry_run:
         print("\n[DRY RUN] Would sync:")
-        for task in unique_tasks:
-            cal_id = map_task_to_calendar(task, config)
+        for task in candidates:
+            cal_id = router.route(task)['calendar']
             print(f"  - {task['description']} → {cal_id}")
         return 0
 
+    # Skip tasks whose event body is unchanged since the last sync
+    with metrics.phase('plan'):
+        plans, skipped = plan_sync(tasks, config, state, complete)
+    metrics.count_tasks('unchanged', skipped)
+    metrics.count_tasks('changed', len(plans))
+    print(f"Unchanged since last sync: {skipped}")
+
+    # Mutations left over from a failed run go first
+    journal = MutationJournal()
+    changed = len(plans)
+    plans = journal.queue(plans, tasks, complete)
+    if len(plans) > changed:
+        metrics.count_tasks('replayed', len(plans) - changed)
+        print(f"Replaying {len(plans) - changed} journaled mutations")
+
+    if not plans:
+        journal.settle(plans)
+        state['watermark'] = next_watermark(run_started)
+        save_sync_state(state)
+        print(f"\n[ClaudeWarrior] Synced 0/{len(candidates)} tasks")
+        return 0
+
     # Get Google Calendar service
+    if client is None:
+        try:
+            with metrics.phase('auth'):
+                client = make_client(get_gcal_service(), config, metrics)
+        except RuntimeError as e:
+            print(f"ERROR: {e}", file=sys.stderr)
+            return 1
+
+    try:
+        # One list call per target calendar (deltas only after the first run)
+        synced_count = sync_calendars(client, plans, state, batch, workers, legacy)
+        journal.settle(plans)
+        # Advance the watermark when every changed task made it or is
+        # journaled for replay; tasks that failed for good are re-exported
+        if journal.covers(plans):
+            state['watermark'] = next_watermark(run_started)
+    finally:
+        save_sync_state(state)
+
+    if journal.pending:
+        print(f"{len(journal.pending)} mutations journaled for the next run")
+
+    print(f"\n[ClaudeWarrior] Synced {synced_count}/{len(plans)} changed or removed tasks")
+    return 0
+
+
+def notify_watcher(hook_input):
+    """Taskwarrior hook entry point: pass the task through, ping the watcher
+
+    on-add hooks get the new task, on-modify hooks the original and the
+    modified task, one JSON object per line. The last line is echoed back
+    unchanged and its uuid sent to a running --watch process. Hooks must
+    never block or fail the task command, so errors are ignored.
+    """
+    lines = [line for line in hook_input if line.strip()]
+    if not lines:
+        return 0
+    print(lines[-1].rstrip('\n'))
+
+    try:
+        uuid = json.loads(lines[-1])['uuid']
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+            sock.sendto(uuid.encode('utf-8'), str(GCAL_WATCH_SOCKET))
+    except (OSError, ValueError, KeyError):
+        pass
+    return 0
+
+
+def listen_for_hooks(changes):
+    """Feed task uuids sent by notify_watcher() hooks into the change queue"""
+    try:
+        GCAL_WATCH_SOCKET.unlink()
+    except FileNotFoundError:
+        pass
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    sock.bind(str(GCAL_WATCH_SOCKET))
+    while True:
+        data = sock.recv(256)
+        changes.put(('task', data.decode('utf-8', 'replace').strip()))
+
+
+def watch_data_dir(changes):
+    """Poll the Taskwarrior data files and report modifications"""
+    def signature():
+        files = []
+        for entry in os.scandir(TASK_DATA_DIR):
+            if entry.is_file():
+                stat = entry.stat()
+                files.append((entry.name, stat.st_mtime_ns, stat.st_size))
+        return sorted(files)
+
+    last = signature()
+    while True:
+        time.sleep(WATCH_POLL_INTERVAL)
+        current = signature()
+        if current != last:
+            last = current
+            changes.put(('data', None))
+
+
+def wait_for_changes(changes, idle_timeout=None):
+    """Block until a burst of changes has settled
+
+    Returns (uuids, data_changed): the task uuids reported by hooks and
+    whether the data files changed. With idle_timeout, returns empty-handed
+    once that many seconds pass without any change.
+    """
+    try:
+        burst = [changes.get(timeout=idle_timeout)]
+    except queue.Empty:
+        return set(), False
+    deadline = time.monotonic() + WATCH_MAX_DELAY
+    while True:
+        timeout = min(WATCH_DEBOUNCE, deadline - time.monotonic())
+        if timeout <= 0:
+            break
+        try:
+            burst.append(changes.get(timeout=timeout))
+        except queue.Empty:
+            break
+
+    uuids = {value for kind, value in burst if kind == 'task' and value}
+    data_changed = any(kind == 'data' for kind, _ in burst)
+    return uuids, data_changed
+
+
+def watch_and_sync(batch=False, show_metrics=False, metrics_history=False):
+    """Long-running sync: push only the tasks that changed
+
+    With --metrics the progress output goes to stderr and stdout carries
+    one JSON report per sync.
+    """
+    report_stream = sys.stdout
+    with redirect_stdout(sys.stderr) if show_metrics else nullcontext():
+        return run_watch(batch, show_metrics, metrics_history, report_stream)
+
+
+def run_watch(batch, show_metrics, metrics_history, report_stream):
+    """Watch loop of watch_and_sync()
+
+    The authenticated service (and its HTTP connections) is created once
+    and reused for every sync.
+    """
+    print("[ClaudeWarrior] Watching Taskwarrior for changes...")
+
+    config = load_config()
+    if not config.get('google_calendar', {}).get('enabled', False):
+        print("Google Calendar integration disabled in config")
+        print(f"Enable it in {CONFIG_FILE}")
+        return 0
+
+    try:
+        get_router(config)
+    except (TypeError, ValueError) as e:
+        print(f"ERROR: Invalid routing_rules in {CONFIG_FILE}: {e}", file=sys.stderr)
+        return 1
+
     try:
         service = get_gcal_service()
     except RuntimeError as e:
         print(f"ERROR: {e}", file=sys.stderr)
         return 1
+    client = make_client(service, config)
+    track_metrics = show_metrics or metrics_history
+    workers = config['google_calendar'].get('workers', GCAL_DEFAULT_WORKERS)
+    state = load_sync_state()
+    journal = MutationJournal()
 
-    # Sync each task
-    synced_count = 0
-    for task in unique_tasks:
-        try:
-            cal_id = map_task_to_calendar(task, config)
-            if not cal_id:
-                print(f"WARNING: No calendar for task {task['id']}, skipping", file=sys.stderr)
-                continue
+    changes = queue.Queue()
+    threading.Thread(target=listen_for_hooks, args=(changes,), daemon=True).start()
+    threading.Thread(target=watch_data_dir, args=(changes,), daemon=True).start()
 
-            event = task_to_event(task, config)
-
-            # Check if event already exists (search by description containing task ID)
-            events_result = service.events().list(
-                calendarId=cal_id,
-                q=f"Task ID: {task['id']}",
-                maxResults=1
-            ).execute()
-
-            existing_events = events_result.get('items', [])
-
-            if existing_events:
-                # Update existing event
-                event_id = existing_events[0]['id']
-                service.events().update(
-                    calendarId=cal_id,
-                    eventId=event_id,
-                    body=event
-                ).execute()
-                print(f"  ✓ Updated: {task['description']}")
+    # Catch up on everything modified while the watcher was not running
+    changes.put(('data', None))
+
+    try:
+        while True:
+            # Retry journaled mutations periodically, even without changes
+            uuids, data_changed = wait_for_changes(
+                changes, WATCH_RETRY_INTERVAL if journal.pending else None
+            )
+
+            # The watermark covers every task changed since the last push;
+            # before the first watermark hook events name the tasks
+            complete = False
+            if state.get('watermark'):
+                filters = [f"modified.after:{state['watermark']}"]
+            elif uuids and not data_changed:
+                filters = sorted(uuids)
             else:
-                # Create new event
-                service.events().insert(
-                    calendarId=cal_id,
-                    body=event
-                ).execute()
-                print(f"  ✓ Created: {task['description']}")
+                filters = ['(', 'status:pending', 'or', 'status:recurring', ')']
+                complete = True
 
-            synced_count += 1
+            run_started = datetime.now(timezone.utc)
+            metrics = client.metrics = SyncMetrics('watch')
+            try:
+                with metrics.phase('export'):
+                    tasks = export_sync_tasks(filters, complete)
+            except (OSError, RuntimeError) as e:
+                print(f"ERROR: {e}", file=sys.stderr)
+                continue
 
-        except Exception as e:
-            print(f"ERROR syncing task {task['id']}: {e}", file=sys.stderr)
+            with metrics.phase('plan'):
+                plans, skipped = plan_sync(tasks, config, state, complete)
+            metrics.count_tasks('exported', len(tasks))
+            metrics.count_tasks('unchanged', skipped)
+            metrics.count_tasks('changed', len(plans))
 
-    print(f"\n[ClaudeWarrior] Synced {synced_count}/{len(unique_tasks)} tasks")
-    return 0
+            changed = len(plans)
+            plans = journal.queue(plans, tasks, complete)
+            if len(plans) > changed:
+                metrics.count_tasks('replayed', len(plans) - changed)
+
+            if plans:
+                synced_count = sync_calendars(client, plans, state, batch, workers)
+                print(f"[ClaudeWarrior] Synced {synced_count}/{len(plans)} changed or removed tasks")
+                if track_metrics:
+                    emit_metrics(metrics, show_metrics, metrics_history, report_stream)
+            journal.settle(plans)
+            if journal.pending:
+                print(f"[ClaudeWarrior] {len(journal.pending)} mutations journaled, retrying in {WATCH_RETRY_INTERVAL:.0f}s")
+
+            if journal.covers(plans) and (data_changed or state.get('watermark')):
+                state['watermark'] = next_watermark(run_started)
+            save_sync_state(state)
+    finally:
+        try:
+            GCAL_WATCH_SOCKET.unlink()
+        except FileNotFoundError:
+            pass
 
 
 if __name__ == '__main__':
-    # Support --dry-run flag
+    # Installed as a Taskwarrior on-add/on-modify hook
+    if Path(sys.argv[0]).name.startswith(('on-add', 'on-modify')):
+        sys.exit(notify_watcher(sys.stdin))
+
+    # Support --dry-run, --explain, --batch, --since-last, --pull, --watch and metrics flags
     dry_run = '--dry-run' in sys.argv
+    batch = '--batch' in sys.argv
+    since_last = '--since-last' in sys.argv
+    pull = '--pull' in sys.argv
+    explain = '--explain' in sys.argv
+    show_metrics = '--metrics' in sys.argv
+    metrics_history = '--metrics-history' in sys.argv
 
     try:
-        sys.exit(sync_tasks_to_gcal(dry_run=dry_run))
+        if '--watch' in sys.argv:
+            sys.exit(watch_and_sync(
+                batch=batch, show_metrics=show_metrics, metrics_history=metrics_history
+            ))
+        sys.exit(sync_tasks_to_gcal(
+            dry_run=dry_run, batch=batch, since_last=since_last, pull=pull, explain=explain,
+            show_metrics=show_metrics, metrics_history=metrics_history
+        ))
     except KeyboardInterrupt:
         print("\nSync cancelled by user")
         sys.exit(130)
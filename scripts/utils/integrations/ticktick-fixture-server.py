@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+ClaudeWarrior: Local stand-in for the TickTick Open API
+Serves recorded JSON fixtures so sync-ticktick-tw.py can run offline
+
+Usage:
+    ticktick-fixture-server.py [--port 8765] [--dir DIR] [--latency MS]
+    ticktick-fixture-server.py --record [--dir DIR]
+
+A GET for /open/v1/<path> is answered with DIR/<path>.json, e.g.
+/open/v1/project/inbox/data → DIR/project/inbox/data.json; POSTs (task
+updates) are echoed back without changing the fixtures. Any bearer
+token is accepted. Responses carry ETag and Last-Modified headers and
+honour If-None-Match / If-Modified-Since with 304.
+
+--record fetches the project list and every project's data from the
+real API with the configured token and writes them to DIR.
+
+Point the importer at the server with:
+    TICKTICK_API_BASE=http://127.0.0.1:8765/open/v1 sync-ticktick-tw.py --dry-run
+"""
+
+import hashlib
+import importlib.util
+import json
+import sys
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+FIXTURES_DIR = SCRIPTS_DIR / "fixtures" / "ticktick"
+API_PREFIX = '/open/v1'
+DEFAULT_PORT = 8765
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Request handler mapping API paths onto fixture files"""
+
+    fixtures_dir = FIXTURES_DIR
+    latency = 0.0
+
+    def do_GET(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+        if not self.headers.get('Authorization', '').startswith('Bearer '):
+            return self.send_json(401, {'errorMessage': 'unauthorized'})
+
+        path = self.path.split('?', 1)[0]
+        if path.startswith(API_PREFIX):
+            path = path[len(API_PREFIX):]
+        fixture = (self.fixtures_dir / (path.strip('/') + '.json')).resolve()
+        if self.fixtures_dir.resolve() not in fixture.parents or not fixture.is_file():
+            return self.send_json(404, {'errorMessage': 'not found'})
+
+        body = fixture.read_bytes()
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        mtime = int(fixture.stat().st_mtime)
+        if self.not_modified(etag, mtime):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', formatdate(mtime, usegmt=True))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        """Task updates: accepted and echoed back, fixtures stay unchanged"""
+        if not self.headers.get('Authorization', '').startswith('Bearer '):
+            return self.send_json(401, {'errorMessage': 'unauthorized'})
+        length = int(self.headers.get('Content-Length', 0))
+        try:
+            payload = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            return self.send_json(400, {'errorMessage': 'invalid JSON'})
+        self.send_json(200, payload)
+
+    def not_modified(self, etag, mtime):
+        if 'If-None-Match' in self.headers:
+            return etag in [tag.strip() for tag in self.headers['If-None-Match'].split(',')]
+        if 'If-Modified-Since' in self.headers:
+            try:
+                since = parsedate_to_datetime(self.headers['If-Modified-Since']).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return mtime <= since
+        return False
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        print(f"  {self.address_string()} {format % args}", file=sys.stderr)
+
+
+def load_importer():
+    """Import sync-ticktick-tw.py as a module without running main"""
+    spec = importlib.util.spec_from_file_location('sync_ticktick_tw', SCRIPTS_DIR / 'sync-ticktick-tw.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+async def record(client, fixtures_dir):
+    """Fetch the project list and all project data into fixture files"""
+    async with client:
+        projects = await client.projects()
+        write_fixture(fixtures_dir / 'project.json', projects)
+
+        project_ids = ['inbox'] + [project['id'] for project in projects]
+        for project_id in project_ids:
+            data = await client.get(f'/project/{project_id}/data')
+            write_fixture(fixtures_dir / 'project' / project_id / 'data.json', data)
+            print(f"  ✓ Recorded: {project_id} ({len(data.get('tasks', []))} tasks)")
+
+
+def write_fixture(path, payload):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(payload, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+
+
+def main():
+    fixtures_dir = FIXTURES_DIR
+    if '--dir' in sys.argv:
+        fixtures_dir = Path(sys.argv[sys.argv.index('--dir') + 1])
+
+    if '--record' in sys.argv:
+        import asyncio
+
+        importer = load_importer()
+        try:
+            client = importer.get_ticktick_client(importer.load_ticktick_config())
+        except RuntimeError as e:
+            print(f"ERROR: {e}", file=sys.stderr)
+            return 1
+        print(f"[ClaudeWarrior] Recording TickTick fixtures into {fixtures_dir}")
+        asyncio.run(record(client, fixtures_dir))
+        return 0
+
+    port = DEFAULT_PORT
+    if '--port' in sys.argv:
+        port = int(sys.argv[sys.argv.index('--port') + 1])
+    FixtureHandler.fixtures_dir = fixtures_dir
+    if '--latency' in sys.argv:
+        FixtureHandler.latency = float(sys.argv[sys.argv.index('--latency') + 1]) / 1000
+
+    server = ThreadingHTTPServer(('127.0.0.1', port), FixtureHandler)
+    print(f"[ClaudeWarrior] Serving {fixtures_dir} at http://127.0.0.1:{port}{API_PREFIX}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())